@@ -20,6 +20,19 @@ bl_info = {
 import bpy
 import os
 import json
+import sys
+import shutil
+import hashlib
+import struct
+import tempfile
+import subprocess
+import time
+import fnmatch
+import numpy as np
+from contextlib import contextmanager, nullcontext
+from array import array
+from mathutils import Matrix
+from bpy.app.handlers import persistent
 from bpy.props import StringProperty, FloatVectorProperty, FloatProperty, BoolProperty, EnumProperty, PointerProperty, IntProperty
 
 
@@ -32,14 +45,1802 @@ def safe_color(val, default=(1.0, 1.0, 1.0)):
         return list(default)
 
 def get_collections_enum(self, context):
-    root_collection = bpy.data.collections.get("EXPORT_TEST")
-    items = []
-    if root_collection:
-        for col in root_collection.children:
-            items.append((col.name, col.name, ""))
-    if not items:
-        items.append(("NONE", "None", "No collections found"))
-    return items
+    # Blender exige que les items restent référencés : la liste vit dans le registre
+    collection_registry.refresh((context or bpy.context).view_layer)
+    return collection_registry.enum_items
+
+# 1bis. Manifest d'export incrémental (empreintes par collection)
+
+MANIFEST_VERSION = 1
+
+def get_manifest_path(assets_root, project):
+    return os.path.join(assets_root, f"{project}.export_manifest.json")
+
+def load_export_manifest(manifest_path):
+    # tiles : {collection: [noms des tuiles]} du dernier découpage de chaque collection
+    empty = {"version": MANIFEST_VERSION, "collections": {}, "shared": {}, "tiles": {}}
+    if not os.path.exists(manifest_path):
+        return empty
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except Exception:
+        return empty
+    if manifest.get("version") != MANIFEST_VERSION or not isinstance(manifest.get("collections"), dict):
+        return empty
+    manifest.setdefault("shared", {})
+    if "tiles" not in manifest:
+        # Manifest antérieur : une tuile est rangée dans le dossier de sa collection sous un autre nom
+        tiles = manifest["tiles"] = {}
+        for name, entry in manifest["collections"].items():
+            folder = entry.get("model", "").split("/")[-2:-1]
+            if folder and folder[0] != name:
+                tiles.setdefault(folder[0], []).append(name)
+    return manifest
+
+JOURNAL_VERSION = 2
+
+def get_journal_path(assets_root, project):
+    return os.path.join(assets_root, f"{project}.export_journal.jsonl")
+
+class ExportJournal:
+    # <Project>.export_journal.jsonl : un en-tête puis un événement JSON par ligne, ajouté en fin de
+    # fichier (export terminé d'une collection, tuile ou mesh partagé ; fichiers temporaires de la
+    # validation finale ; reprise). Supprimé une fois scène, manifest et matériaux validés : sa
+    # présence signale un export interrompu.
+
+    def __init__(self, path, signature):
+        self.path = path
+        self.data = {"version": JOURNAL_VERSION, "signature": signature, "state": "exporting",
+                     "started": time.time(), "completed": {"collections": {}, "shared": {}}, "staged": []}
+
+    @classmethod
+    def load(cls, path):
+        records = []
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # Dernière ligne tronquée par un crash : les événements précédents restent valides
+                        break
+        except OSError:
+            return None
+        if not records or not isinstance(records[0], dict) or records[0].get("version") != JOURNAL_VERSION:
+            return None
+        journal = cls(path, records[0].get("signature"))
+        journal.data["started"] = records[0].get("started")
+        for record in records[1:]:
+            journal.apply(record)
+        return journal
+
+    def apply(self, record):
+        event = record.get("event")
+        if event == "complete":
+            self.data["completed"][record["section"]][record["name"]] = record["entry"]
+        elif event == "commit":
+            self.data.update(state="committing", staged=record["staged"])
+        elif event == "resume":
+            self.data.update(state="exporting", staged=[])
+
+    def start(self):
+        header = {key: self.data[key] for key in ("version", "signature", "started")}
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + "\n")
+
+    def append(self, record, sync=False):
+        # Une ligne par événement : le coût ne dépend plus du nombre de modèles déjà terminés
+        self.apply(record)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def complete(self, section, name, manifest_entry):
+        self.append({"event": "complete", "section": section, "name": name, "entry": manifest_entry})
+
+    def begin_commit(self, staged):
+        # staged : [(fichier temporaire, destination)], écrits avant le premier os.replace
+        self.append({"event": "commit", "staged": [list(pair) for pair in staged]}, sync=True)
+
+    def resume(self):
+        self.append({"event": "resume"})
+
+    def remove_staged(self):
+        # Fichiers temporaires d'une validation interrompue par un crash
+        for tmp_path, _ in self.data.get("staged", []):
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
+
+    def discard(self):
+        if os.path.isfile(self.path):
+            os.remove(self.path)
+
+def _hash_str(h, *values):
+    for val in values:
+        h.update(str(val).encode('utf-8'))
+        h.update(b'\0')
+
+def _hash_foreach(h, seq, attr, typecode, width):
+    buf = array(typecode, [0]) * (len(seq) * width)
+    if len(buf):
+        seq.foreach_get(attr, buf)
+    h.update(buf.tobytes())
+
+def _hash_rna_props(h, struct):
+    for prop in struct.bl_rna.properties:
+        ident = prop.identifier
+        if ident == "rna_type" or prop.type == 'COLLECTION':
+            continue
+        try:
+            val = getattr(struct, ident)
+        except Exception:
+            continue
+        if prop.type == 'POINTER':
+            val = getattr(val, "name", None)
+        elif hasattr(val, "__iter__") and not isinstance(val, str):
+            val = tuple(val)
+        _hash_str(h, ident, val)
+
+def _hash_mesh(h, mesh):
+    _hash_foreach(h, mesh.vertices, "co", 'f', 3)
+    _hash_foreach(h, mesh.loops, "vertex_index", 'i', 1)
+    _hash_foreach(h, mesh.polygons, "loop_start", 'i', 1)
+    _hash_foreach(h, mesh.polygons, "material_index", 'i', 1)
+    _hash_foreach(h, mesh.polygons, "use_smooth", 'b', 1)
+    for uv_layer in mesh.uv_layers:
+        _hash_str(h, uv_layer.name)
+        _hash_foreach(h, uv_layer.data, "uv", 'f', 2)
+    for attr in getattr(mesh, "color_attributes", []):
+        _hash_str(h, attr.name, attr.domain, attr.data_type)
+        _hash_foreach(h, attr.data, "color", 'f', 4)
+    if getattr(mesh, "has_custom_normals", False):
+        if hasattr(mesh, "corner_normals"):
+            _hash_foreach(h, mesh.corner_normals, "vector", 'f', 3)
+        else:
+            mesh.calc_normals_split()
+            _hash_foreach(h, mesh.loops, "normal", 'f', 3)
+
+# Empreinte des poids par mesh (pointeur -> ((nom, nb vertices), digest)). L'API n'offre pas de
+# foreach_get pour les groupes de vertex : la lecture reste une boucle par vertex, refaite seulement
+# après une mise à jour de géométrie du mesh signalée au handler depsgraph (forget_vertex_weights).
+_vertex_weight_digests = {}
+
+def _vertex_weights_digest(mesh):
+    key = (mesh.name, len(mesh.vertices))
+    cached = _vertex_weight_digests.get(mesh.as_pointer())
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    weights = np.array([(v.index, g.group, g.weight) for v in mesh.vertices for g in v.groups], dtype=np.float32)
+    digest = hashlib.sha1(weights.tobytes()).digest()
+    # Sans le handler (module chargé sans register), rien n'invaliderait le cache
+    if _registry_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        _vertex_weight_digests[mesh.as_pointer()] = (key, digest)
+    return digest
+
+def forget_vertex_weights(depsgraph=None):
+    # depsgraph None : tout oublier (chargement, undo : les pointeurs ne sont plus fiables)
+    if depsgraph is None:
+        _vertex_weight_digests.clear()
+        return
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            id_data = id_data.data
+        if isinstance(id_data, bpy.types.Mesh):
+            _vertex_weight_digests.pop(id_data.as_pointer(), None)
+
+def _hash_deform_data(h, obj):
+    # Données exportées en glTF mais absentes du mesh évalué : poids des groupes de vertex, shape keys
+    mesh = obj.data
+    if obj.vertex_groups and isinstance(mesh, bpy.types.Mesh):
+        _hash_str(h, *(g.name for g in obj.vertex_groups))
+        h.update(_vertex_weights_digest(mesh))
+    shape_keys = getattr(mesh, "shape_keys", None)
+    if shape_keys is not None:
+        for block in shape_keys.key_blocks:
+            _hash_str(h, block.name, block.value, block.mute, getattr(block.relative_key, "name", None))
+            _hash_foreach(h, block.data, "co", 'f', 3)
+
+def _hash_image(h, img):
+    _hash_str(h, img.name, img.source, img.filepath, tuple(img.size))
+    if img.packed_file is not None:
+        h.update(hashlib.sha1(img.packed_file.data).digest())
+    if img.is_dirty and img.has_data:
+        # Peinte sans être sauvée : seul le contenu des pixels distingue deux retouches
+        pixels = np.empty(len(img.pixels), dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        h.update(pixels.tobytes())
+    path = bpy.path.abspath(img.filepath) if img.filepath else ""
+    if path and os.path.isfile(path):
+        st = os.stat(path)
+        _hash_str(h, st.st_size, st.st_mtime_ns)
+
+def _hash_node_tree(h, tree, seen_groups):
+    for node in tree.nodes:
+        _hash_str(h, node.name, node.bl_idname)
+        # Les noeuds RGB et Value gardent leur valeur sur la sortie
+        for sock in list(node.inputs) + list(node.outputs):
+            if hasattr(sock, "default_value"):
+                val = sock.default_value
+                _hash_str(h, sock.identifier, tuple(val) if hasattr(val, "__iter__") else val)
+        img = getattr(node, "image", None)
+        if img is not None:
+            _hash_image(h, img)
+        # Groupe de noeuds : son arbre est haché une fois par matériau, groupes imbriqués compris
+        group = getattr(node, "node_tree", None) if node.type == 'GROUP' else None
+        if group is not None:
+            _hash_str(h, "group", group.name)
+            if group.name not in seen_groups:
+                seen_groups.add(group.name)
+                _hash_node_tree(h, group, seen_groups)
+    for link in tree.links:
+        _hash_str(h, link.from_node.name, link.from_socket.identifier, link.to_node.name, link.to_socket.identifier)
+
+def _hash_material(h, mat):
+    _hash_str(h, mat.name, tuple(mat.diffuse_color), mat.metallic, mat.roughness)
+    for key in sorted(mat.keys()):
+        # exclude_from_nee ne touche que le .material.json et le noeud, jamais le glTF
+        if key != "exclude_from_nee":
+            _hash_str(h, key, mat[key])
+    if mat.use_nodes and mat.node_tree:
+        _hash_node_tree(h, mat.node_tree, set())
+
+def iter_instanced_objects(obj, matrix_world=None, depth=0):
+    # (objet, matrice monde) du contenu d'une collection instanciée par obj, instances imbriquées comprises
+    inst_col = obj.instance_collection if obj.instance_type == 'COLLECTION' else None
+    if inst_col is None or depth > 16:
+        return
+    base = (matrix_world if matrix_world is not None else obj.matrix_world) @ Matrix.Translation(-inst_col.instance_offset)
+    for src in inst_col.all_objects:
+        if src.hide_viewport:
+            continue
+        world = base @ src.matrix_world
+        yield src, world
+        yield from iter_instanced_objects(src, world, depth + 1)
+
+def _hash_object(h, obj, depsgraph, matrix_world, bounds, seen_materials):
+    _hash_str(h, obj.name, obj.type)
+    h.update(array('f', [v for row in matrix_world for v in row]).tobytes())
+    for mod in obj.modifiers:
+        _hash_str(h, mod.name, mod.type)
+        _hash_rna_props(h, mod)
+    if obj.type in {'MESH', 'CURVE', 'SURFACE', 'META', 'FONT'}:
+        obj_eval = obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        if mesh is not None:
+            _hash_mesh(h, mesh)
+            if bounds is not None:
+                bounds.add_mesh(mesh, matrix_world)
+        obj_eval.to_mesh_clear()
+        _hash_deform_data(h, obj)
+    for slot in getattr(obj, "material_slots", []):
+        mat = slot.material
+        _hash_str(h, getattr(mat, "name", None))
+        if mat is not None and mat.name not in seen_materials:
+            seen_materials.add(mat.name)
+            _hash_material(h, mat)
+
+def collection_fingerprint(context, collection, visible_objects, options=(), bounds=None):
+    # bounds (WorldBounds) : réutilise les meshes évalués pour le hachage plutôt que de les réévaluer
+    depsgraph = context.evaluated_depsgraph_get()
+    h = hashlib.sha1()
+    _hash_str(h, collection.name, *options)
+    seen_materials = set()
+    for obj in sorted(visible_objects, key=lambda o: o.name):
+        _hash_object(h, obj, depsgraph, obj.matrix_world, bounds, seen_materials)
+        # Une collection instanciée est exportée avec son contenu : ses objets comptent aussi
+        for src, world in iter_instanced_objects(obj):
+            _hash_str(h, "instance")
+            _hash_object(h, src, depsgraph, world, bounds, seen_materials)
+    return h.hexdigest()
+
+# 1octies. Bornes monde vectorisées (AABB et sphères englobantes)
+
+class WorldBounds:
+    # Accumule les sommets évalués objet par objet (foreach_get + NumPy) sans garder la géométrie :
+    # seule une AABB et une sphère par objet sont conservées, fusionnées à la fin.
+
+    def __init__(self):
+        self.min = None
+        self.max = None
+        self.spheres = []
+
+    def _merge(self, lo, hi, center, radius):
+        self.min = lo if self.min is None else np.minimum(self.min, lo)
+        self.max = hi if self.max is None else np.maximum(self.max, hi)
+        self.spheres.append((center, radius))
+
+    def add_mesh(self, mesh, matrix_world):
+        count = len(mesh.vertices)
+        if not count:
+            return
+        co = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        matrix = np.array(matrix_world, dtype=np.float64)
+        world = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        lo, hi = world.min(axis=0), world.max(axis=0)
+        center = (lo + hi) * 0.5
+        radius = float(np.sqrt(np.einsum('ij,ij->i', world - center, world - center).max()))
+        self._merge(lo, hi, center, radius)
+
+    def add_point(self, point):
+        p = np.array(point, dtype=np.float64)
+        self._merge(p, p, p, 0.0)
+
+    def add_boxes(self, lo, hi):
+        # lo, hi : (n, 3) ; une sphère par boîte (centre, demi-diagonale)
+        if not len(lo):
+            return
+        self.min = lo.min(axis=0) if self.min is None else np.minimum(self.min, lo.min(axis=0))
+        self.max = hi.max(axis=0) if self.max is None else np.maximum(self.max, hi.max(axis=0))
+        centers = (lo + hi) * 0.5
+        radii = np.linalg.norm(hi - lo, axis=1) * 0.5
+        self.spheres.extend(zip(centers, radii.tolist()))
+
+    def merge(self, other):
+        if other.is_empty():
+            return
+        self.min = other.min if self.min is None else np.minimum(self.min, other.min)
+        self.max = other.max if self.max is None else np.maximum(self.max, other.max)
+        self.spheres.extend(other.spheres)
+
+    def is_empty(self):
+        return self.min is None
+
+    def center(self):
+        return (self.min + self.max) * 0.5
+
+    def sphere(self):
+        center = self.center()
+        radius = max(float(np.linalg.norm(c - center)) + r for c, r in self.spheres)
+        return center, radius
+
+    def to_node_fields(self, with_sphere=False):
+        # Blender Z-up -> Y-up (x, z, -y) : l'axe inversé échange min et max
+        lo, hi = self.min, self.max
+        r = lambda v: round(float(v), 6) + 0.0
+        fields = {"bounds": {
+            "min": [r(lo[0]), r(lo[2]), r(-hi[1])],
+            "max": [r(hi[0]), r(hi[2]), r(-lo[1])],
+        }}
+        if with_sphere:
+            center, radius = self.sphere()
+            fields["boundingSphere"] = {"center": [r(center[0]), r(center[2]), r(-center[1])], "radius": r(radius)}
+        return fields
+
+# 1undecies. Découpage spatial des grosses collections en tuiles (grille ou octree)
+
+TILE_PREFIXES = ("tile_", "oct_")
+
+def object_world_boxes(objects):
+    # AABB monde de chaque objet à partir de son bound_box (8 coins), en un seul calcul NumPy
+    corners = np.array([obj.bound_box for obj in objects], dtype=np.float64).reshape(-1, 8, 3)
+    matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+    world = np.einsum('nij,nkj->nki', matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+def grid_tiles(centers, tile_size):
+    # Grille uniforme dans le plan XY : {suffixe: [indices]}
+    keys = np.floor(centers[:, :2] / tile_size).astype(np.int64)
+    tiles = {}
+    for i, (ix, iy) in enumerate(keys):
+        tiles.setdefault(f"tile_{ix}_{iy}", []).append(i)
+    return tiles
+
+def octree_tiles(centers, max_objects, max_depth=8):
+    # Subdivision en octants jusqu'à max_objects objets par feuille : {suffixe: [indices]}
+    tiles = {}
+
+    def split(indices, lo, hi, path):
+        if len(indices) <= max_objects or len(path) >= max_depth:
+            tiles[f"oct_{path or 'r'}"] = list(indices)
+            return
+        mid = (lo + hi) * 0.5
+        c = centers[indices]
+        octants = (c[:, 0] >= mid[0]) * 1 + (c[:, 1] >= mid[1]) * 2 + (c[:, 2] >= mid[2]) * 4
+        for octant in range(8):
+            sub = indices[octants == octant]
+            if len(sub):
+                bits = np.array([octant & 1, octant & 2, octant & 4], dtype=bool)
+                split(sub, np.where(bits, mid, lo), np.where(bits, hi, mid), path + str(octant))
+
+    split(np.arange(len(centers)), centers.min(axis=0), centers.max(axis=0), "")
+    return tiles
+
+def plan_tiles(objects, mode, tile_size, max_objects):
+    # -> [(suffixe, objets)] trié, ou [] si la collection tient dans une seule tuile
+    if len(objects) <= max_objects:
+        return []
+    lo, hi = object_world_boxes(objects)
+    centers = (lo + hi) * 0.5
+    tiles = grid_tiles(centers, tile_size) if mode == 'GRID' else octree_tiles(centers, max_objects)
+    if len(tiles) <= 1:
+        return []
+    return [(suffix, [objects[i] for i in indices]) for suffix, indices in sorted(tiles.items())]
+
+# 1ter. Export glTF par collection et workers Blender parallèles
+
+def get_visible_objects(view_layer, collection):
+    return [obj for obj in collection.objects if not obj.hide_viewport and obj.name in view_layer.objects]
+
+def get_material_warnings(objects):
+    warning_objs = []
+    for obj in objects:
+        if obj.type == 'MESH':
+            has_mat = False
+            if hasattr(obj, 'material_slots') and len(obj.material_slots) > 0:
+                has_mat = any(slot.material is not None for slot in obj.material_slots)
+            if not has_mat:
+                warning_objs.append(obj.name)
+    return warning_objs
+
+def supported_gltf_options(options):
+    # Les options du glTF exporter varient selon la version de Blender : on ignore les inconnues,
+    # ainsi que les valeurs d'enum absentes de cette version (WEBP, NONE...), qui gardent le défaut
+    properties = bpy.ops.export_scene.gltf.get_rna_type().properties
+    supported = {}
+    for key, value in options.items():
+        prop = properties.get(key)
+        if prop is None:
+            continue
+        # Enum dynamique (export_format) : pas d'items à comparer
+        items = prop.enum_items.keys() if prop.type == 'ENUM' else []
+        values = value if isinstance(value, (set, frozenset)) else {value}
+        if items and not all(v in items for v in values):
+            continue
+        supported[key] = value
+    return supported
+
+def get_gltf_export_options(settings):
+    if not settings["export_textures"]:
+        image_format = 'NONE'
+    else:
+        image_format = {'JPEG': 'JPEG', 'WEBP': 'WEBP'}.get(settings["texture_format"], 'AUTO')
+    return {
+        "export_format": 'GLB' if settings["export_format"] == 'GLB' else 'GLTF_SEPARATE',
+        "export_image_format": image_format,
+        "export_draco_mesh_compression_enable": settings["use_draco"],
+        "export_draco_mesh_compression_level": settings["draco_level"],
+        "export_animations": settings["export_animations"],
+    }
+
+def find_layer_collection(layer_collection, collection):
+    if layer_collection.collection == collection:
+        return layer_collection
+    for child in layer_collection.children:
+        found = find_layer_collection(child, collection)
+        if found is not None:
+            return found
+    return None
+
+def can_export_active_collection(collection, objects):
+    # La collection entière (tous ses objets visibles) et un exporteur capable de s'y limiter
+    if collection is None or len(objects) != len(collection.objects):
+        return False
+    known = bpy.ops.export_scene.gltf.get_rna_type().properties.keys()
+    if "use_active_collection" not in known:
+        return False
+    return not collection.children or "use_active_collection_with_nested" in known
+
+def export_collection_gltf(objects, gltf_path, options=None, profiler=None, collection=None):
+    # Export limité à la collection active du view layer quand c'est possible : ni désélection
+    # de la scène entière, ni perte de la sélection de l'utilisateur. Sinon repli sur la
+    # sélection, en ne touchant que les objets sélectionnés, puis restauration.
+    options = dict({"export_format": 'GLTF_SEPARATE'}, **(options or {}))
+    view_layer = bpy.context.view_layer
+    layer_collection = None
+    if can_export_active_collection(collection, objects):
+        layer_collection = find_layer_collection(view_layer.layer_collection, collection)
+
+    if layer_collection is not None:
+        previous_active = view_layer.active_layer_collection
+        view_layer.active_layer_collection = layer_collection
+        try:
+            with profile_stage(profiler, "gltf_export"):
+                bpy.ops.export_scene.gltf(
+                    filepath=gltf_path,
+                    use_selection=False,
+                    use_active_collection=True,
+                    export_apply=True,
+                    **supported_gltf_options(dict(options, use_active_collection_with_nested=False))
+                )
+        finally:
+            view_layer.active_layer_collection = previous_active
+        return
+
+    with profile_stage(profiler, "selection"):
+        previous_selection = [obj for obj in view_layer.objects.selected]
+        previous_active = view_layer.objects.active
+        for obj in previous_selection:
+            obj.select_set(False)
+        for obj in objects:
+            obj.select_set(True)
+    try:
+        with profile_stage(profiler, "gltf_export"):
+            bpy.ops.export_scene.gltf(
+                filepath=gltf_path,
+                use_selection=True,
+                export_apply=True,
+                **supported_gltf_options(options)
+            )
+    finally:
+        with profile_stage(profiler, "selection"):
+            for obj in objects:
+                obj.select_set(False)
+            for obj in previous_selection:
+                obj.select_set(True)
+            view_layer.objects.active = previous_active
+
+def export_lod_gltf(objects, gltf_path, ratio, options=None, profiler=None, collection=None):
+    # Decimate temporaire sur chaque mesh, appliqué par l'exporteur (export_apply) puis retiré
+    added = []
+    try:
+        for obj in objects:
+            if obj.type == 'MESH':
+                mod = obj.modifiers.new("__rtxpt_lod", 'DECIMATE')
+                mod.decimate_type = 'COLLAPSE'
+                mod.ratio = ratio
+                added.append((obj, mod))
+        export_collection_gltf(objects, gltf_path, options, profiler, collection)
+    finally:
+        for obj, mod in added:
+            obj.modifiers.remove(mod)
+
+def export_collection_outputs(objects, entry, options=None, profiler=None, collection=None, animation=None):
+    # entry : {"path", "export_base", "lods": [[ratio, chemin], ...]}
+    # animation : réglages de précalcul (voir baked_animations), None = échantillonnage de l'exporteur
+    with baked_animations(objects, animation, profiler) as all_baked:
+        if all_baked:
+            options = dict(options or {}, export_force_sampling=False)
+        if entry.get("export_base", True):
+            export_collection_gltf(objects, entry["path"], options, profiler, collection)
+        for ratio, lod_path in entry.get("lods", []):
+            export_lod_gltf(objects, lod_path, ratio, options, profiler, collection)
+
+def parse_lod_levels(ratios_text, screen_sizes_text):
+    # "0.5, 0.25" -> [(0.5, seuil), (0.25, seuil)] ; un seuil manquant vaut la moitié du précédent
+    ratios = [float(v) for v in ratios_text.replace(";", ",").split(",") if v.strip()]
+    sizes = [float(v) for v in screen_sizes_text.replace(";", ",").split(",") if v.strip()]
+    if any(not 0.0 < r < 1.0 for r in ratios):
+        raise ValueError("LOD ratios must be between 0 and 1 (exclusive)")
+    levels = []
+    for i, ratio in enumerate(ratios):
+        size = sizes[i] if i < len(sizes) else (levels[-1][1] if levels else 1.0) * 0.5
+        levels.append((ratio, size))
+    return levels
+
+def split_export_jobs(jobs, worker_count):
+    # Répartition gloutonne : la collection la plus lourde va au worker le moins chargé
+    buckets = [[] for _ in range(max(1, min(worker_count, len(jobs))))]
+    loads = [0] * len(buckets)
+    for job in sorted(jobs, key=lambda j: j["weight"], reverse=True):
+        idx = loads.index(min(loads))
+        buckets[idx].append(job)
+        loads[idx] += job["weight"]
+    return [b for b in buckets if b]
+
+def run_parallel_export(jobs, worker_count, blender_exe, options=None, animation=None):
+    # jobs : [{"name", "path", "weight"}]
+    # -> (collections exportées, {collection: erreur}, objets sans matériau, {collection: secondes dans le worker})
+    work_dir = tempfile.mkdtemp(prefix="rtxpt_export_")
+    exported, errors, warnings, timings = [], {}, [], {}
+    try:
+        snapshot = os.path.join(work_dir, "snapshot.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=snapshot, copy=True, check_existing=False)
+
+        workers = []
+        for w, bucket in enumerate(split_export_jobs(jobs, worker_count)):
+            job_path = os.path.join(work_dir, f"job_{w}.json")
+            result_path = os.path.join(work_dir, f"result_{w}.json")
+            log_path = os.path.join(work_dir, f"worker_{w}.log")
+            with open(job_path, 'w', encoding='utf-8') as f:
+                json.dump({"collections": [{"name": j["name"], "collection": j["collection"].name, "path": j["path"],
+                                            "objects": [o.name for o in j["objects"]],
+                                            "export_base": j["export_base"], "lods": j["lods"]}
+                                           for j in bucket],
+                           "options": options or {},
+                           "animation": animation,
+                           "result": result_path}, f)
+            log = open(log_path, 'w', encoding='utf-8')
+            proc = subprocess.Popen(
+                [blender_exe, "-b", snapshot, "--factory-startup",
+                 "--python", os.path.abspath(__file__), "--", "--rtxpt-worker", job_path],
+                stdout=log, stderr=subprocess.STDOUT
+            )
+            workers.append((proc, log, bucket, result_path, log_path))
+
+        for proc, log, bucket, result_path, log_path in workers:
+            proc.wait()
+            log.close()
+            try:
+                with open(result_path, 'r', encoding='utf-8') as f:
+                    result = json.load(f)
+            except Exception:
+                with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+                    tail = f.read()[-300:].strip()
+                for job in bucket:
+                    errors[job["name"]] = f"worker exited with code {proc.returncode}: {tail}"
+                continue
+            exported.extend(result.get("exported", []))
+            errors.update(result.get("errors", {}))
+            warnings.extend(result.get("warnings", []))
+            timings.update(result.get("timings", {}))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return exported, errors, warnings, timings
+
+def run_export_worker(job_path):
+    with open(job_path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+
+    result = {"exported": [], "errors": {}, "warnings": [], "timings": {}}
+    view_layer = bpy.context.view_layer
+    for entry in job["collections"]:
+        name = entry["name"]
+        collection = bpy.data.collections.get(entry.get("collection", name))
+        if collection is None:
+            result["errors"][name] = "collection not found in snapshot"
+            continue
+        start = time.perf_counter()
+        try:
+            if "objects" in entry:
+                visible_objects = [bpy.data.objects[n] for n in entry["objects"] if n in bpy.data.objects]
+            else:
+                visible_objects = get_visible_objects(view_layer, collection)
+            result["warnings"].extend(get_material_warnings(visible_objects))
+            os.makedirs(os.path.dirname(entry["path"]), exist_ok=True)
+            export_collection_outputs(visible_objects, entry, job.get("options"), collection=collection,
+                                      animation=job.get("animation"))
+            result["exported"].append(name)
+        except Exception as e:
+            result["errors"][name] = str(e)
+        result["timings"][name] = time.perf_counter() - start
+
+    with open(job["result"], 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+# 1terdecies. Animations : F-curves échantillonnées en NumPy, clés réduites, cache par action
+
+KEYFRAME_CONSTANT, KEYFRAME_LINEAR = 0, 1  # valeurs de Keyframe.interpolation pour foreach_get/set
+animation_cache = {}
+
+def action_fcurves(anim_data):
+    action = anim_data.action
+    if hasattr(anim_data, "action_slot"):
+        # Blender 4.4+ : les F-curves vivent dans le channelbag du slot assigné
+        from bpy_extras import anim_utils
+        slot = anim_data.action_slot
+        channelbag = anim_utils.action_get_channelbag_for_slot(action, slot) if slot is not None else None
+        return list(channelbag.fcurves) if channelbag is not None else []
+    return list(action.fcurves)
+
+# (propriété, largeur, dtype) : de quoi restaurer exactement les clés d'une F-curve
+KEYFRAME_FIELDS = [
+    ("co", 2, np.float32), ("handle_left", 2, np.float32), ("handle_right", 2, np.float32),
+    ("interpolation", 1, np.int32), ("handle_left_type", 1, np.int32), ("handle_right_type", 1, np.int32),
+    ("easing", 1, np.int32), ("type", 1, np.int32),
+    ("back", 1, np.float32), ("amplitude", 1, np.float32), ("period", 1, np.float32),
+    ("select_control_point", 1, bool), ("select_left_handle", 1, bool), ("select_right_handle", 1, bool),
+]
+
+def animation_kind(obj):
+    # None (pas animé), 'ACTION' (seules les F-curves de l'action active comptent) ou 'COMPLEX'
+    # (drivers, NLA, contraintes : laissé à l'échantillonnage de l'exporteur)
+    anim_data = obj.animation_data
+    if anim_data is None or (anim_data.action is None and not anim_data.drivers and not anim_data.nla_tracks):
+        return None
+    if anim_data.action is None or anim_data.drivers or any(not t.mute for t in anim_data.nla_tracks):
+        return 'COMPLEX'
+    if obj.constraints or (obj.pose is not None and any(b.constraints for b in obj.pose.bones)):
+        return 'COMPLEX'
+    return 'ACTION'
+
+def action_digest(fcurves):
+    h = hashlib.sha1()
+    for fc in fcurves:
+        _hash_str(h, fc.data_path, fc.array_index, fc.extrapolation)
+        keys = fc.keyframe_points
+        _hash_foreach(h, keys, "co", 'f', 2)
+        _hash_foreach(h, keys, "handle_left", 'f', 2)
+        _hash_foreach(h, keys, "handle_right", 'f', 2)
+        _hash_foreach(h, keys, "interpolation", 'i', 1)
+        for mod in fc.modifiers:
+            _hash_str(h, mod.type)
+            _hash_rna_props(h, mod)
+    return h.hexdigest()
+
+def animation_frames(animation):
+    start, end, step = animation["frame_start"], animation["frame_end"], max(1, animation["frame_step"])
+    frames = np.arange(start, end + 1, step, dtype=np.float64)
+    if frames[-1] != end:
+        frames = np.append(frames, float(end))
+    return frames
+
+def sample_fcurve(fc, frames):
+    # Clés exactes, segments LINEAR et CONSTANT et extrapolation constante en NumPy ;
+    # seuls les segments Bézier/easing et les courbes à modificateurs passent par fc.evaluate
+    n = len(fc.keyframe_points)
+    if n == 0 or len(fc.modifiers):
+        return np.fromiter((fc.evaluate(f) for f in frames), dtype=np.float64, count=len(frames))
+    co = np.empty(n * 2, dtype=np.float64)
+    fc.keyframe_points.foreach_get("co", co)
+    x, y = co[0::2], co[1::2]
+    interp = np.empty(n, dtype=np.int32)
+    fc.keyframe_points.foreach_get("interpolation", interp)
+
+    seg = np.searchsorted(x, frames, side='right') - 1
+    left = np.clip(seg, 0, n - 1)
+    values = y[left].copy()
+    values[seg < 0] = y[0]
+    slow = np.zeros(len(frames), dtype=bool)
+    if fc.extrapolation != 'CONSTANT':
+        slow |= (seg < 0) | (seg >= n - 1)
+    inner = (seg >= 0) & (seg < n - 1) & (frames != x[left])
+    linear = inner & (interp[left] == KEYFRAME_LINEAR)
+    values[linear] = np.interp(frames[linear], x, y)
+    slow |= inner & (interp[left] != KEYFRAME_LINEAR) & (interp[left] != KEYFRAME_CONSTANT)
+    for i in np.flatnonzero(slow):
+        values[i] = fc.evaluate(frames[i])
+    return values
+
+def reduce_keys(frames, values, tolerance):
+    # values : (canaux, frames). Raffinement linéaire à la Ramer-Douglas-Peucker, vectorisé :
+    # à chaque passe, la pire frame de chaque segment hors tolérance devient une clé.
+    n = len(frames)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, n - 1]] = True
+    while True:
+        idx = np.flatnonzero(keep)
+        approx = np.stack([np.interp(frames, frames[idx], row[idx]) for row in values])
+        error = np.abs(approx - values).max(axis=0)
+        error[keep] = 0.0
+        if n <= 2 or error.max() <= tolerance:
+            return idx
+        seg = np.searchsorted(idx, np.arange(n), side='right') - 1
+        worst = np.maximum.reduceat(error, idx[:-1])
+        keep |= (error > tolerance) & (error == worst[np.minimum(seg, len(worst) - 1)])
+
+def bake_action_channels(fcurves, frames, tolerance):
+    # -> [co à plat] dans l'ordre de fcurves ; les canaux d'un même data_path partagent leurs clés
+    groups = {}
+    for fc in fcurves:
+        groups.setdefault(fc.data_path, []).append(fc)
+    baked = {}
+    for group_fcurves in groups.values():
+        values = np.stack([sample_fcurve(fc, frames) for fc in group_fcurves])
+        keep = reduce_keys(frames, values, tolerance)
+        for fc, row in zip(group_fcurves, values):
+            baked[fc.as_pointer()] = np.column_stack([frames[keep], row[keep]]).ravel()
+    return [baked[fc.as_pointer()] for fc in fcurves]
+
+def snapshot_keyframes(fc):
+    keys = fc.keyframe_points
+    snapshot = {}
+    for prop, width, dtype in KEYFRAME_FIELDS:
+        buf = np.empty(len(keys) * width, dtype=dtype)
+        keys.foreach_get(prop, buf)
+        snapshot[prop] = buf
+    return snapshot
+
+def set_keyframes(fc, count, fields):
+    keys = fc.keyframe_points
+    if hasattr(keys, "clear"):
+        keys.clear()
+    else:
+        while len(keys):
+            keys.remove(keys[0], fast=True)
+    keys.add(count)
+    for prop, values in fields.items():
+        keys.foreach_set(prop, values)
+    fc.update()
+
+@contextmanager
+def baked_animations(objects, animation, profiler=None):
+    # animation : {"frame_start", "frame_end", "frame_step", "tolerance", "bake"} ou None.
+    # Le temps de l'export, les clés de chaque action animant un objet sont remplacées par les clés
+    # linéaires réduites (modificateurs de F-curve coupés, déjà pris en compte à l'échantillonnage),
+    # puis restaurées à l'identique : pas d'action temporaire que l'exporteur pourrait aussi exporter.
+    # -> True si tous les objets animés ont été précalculés (échantillonnage de l'exporteur inutile)
+    if not animation or not animation["bake"]:
+        yield False
+        return
+    replaced = []
+    seen = set()
+    all_baked = True
+    try:
+        with profile_stage(profiler, "animation_bake"):
+            frames = animation_frames(animation)
+            for obj in objects:
+                kind = animation_kind(obj)
+                if kind == 'COMPLEX':
+                    all_baked = False
+                if kind != 'ACTION':
+                    continue
+                anim_data = obj.animation_data
+                fcurves = [fc for fc in action_fcurves(anim_data) if fc.as_pointer() not in seen]
+                if not fcurves:
+                    continue
+                seen.update(fc.as_pointer() for fc in fcurves)
+                slot = getattr(anim_data, "action_slot", None)
+                key = (anim_data.action.name, getattr(slot, "identifier", ""), animation["frame_start"],
+                       animation["frame_end"], animation["frame_step"], animation["tolerance"],
+                       action_digest(fcurves))
+                channels = animation_cache.get(key)
+                if channels is None:
+                    channels = bake_action_channels(fcurves, frames, animation["tolerance"])
+                    if len(animation_cache) >= 256:
+                        animation_cache.clear()
+                    animation_cache[key] = channels
+                for fc, co in zip(fcurves, channels):
+                    replaced.append((fc, snapshot_keyframes(fc), [m.mute for m in fc.modifiers]))
+                    for m in fc.modifiers:
+                        m.mute = True
+                    count = len(co) // 2
+                    set_keyframes(fc, count, {"co": co, "interpolation": np.full(count, KEYFRAME_LINEAR, dtype=np.int32)})
+        yield all_baked
+    finally:
+        for fc, snapshot, mutes in reversed(replaced):
+            set_keyframes(fc, len(snapshot["co"]) // 2, snapshot)
+            for m, mute in zip(fc.modifiers, mutes):
+                m.mute = mute
+
+def animation_signature(objects, animation):
+    # Empreinte des actions des objets animés : une clé déplacée réexporte la collection
+    if not animation:
+        return ()
+    signature = ["animation", animation["frame_start"], animation["frame_end"], animation["frame_step"],
+                 animation["bake"], animation["tolerance"]]
+    for obj in sorted(objects, key=lambda o: o.name):
+        anim_data = obj.animation_data
+        if anim_data is not None and anim_data.action is not None:
+            signature += [obj.name, anim_data.action.name, action_digest(action_fcurves(anim_data))]
+    return tuple(signature)
+
+# 1quater. Instanciation des meshes partagés (linked duplicates / collection instances)
+
+def _shared_mesh_key(obj):
+    object_mats = tuple(slot.material.name if slot.material else "" for slot in obj.material_slots if slot.link == 'OBJECT')
+    return (obj.data.name, object_mats)
+
+def _shared_mesh_name(key):
+    mesh_name, object_mats = key
+    if not object_mats:
+        return mesh_name
+    return f"{mesh_name}_{hashlib.sha1('|'.join(object_mats).encode('utf-8')).hexdigest()[:8]}"
+
+def _is_instanceable(obj):
+    # Les modificateurs changent la géométrie par objet : seuls les meshes "nus" sont partagés
+    return obj.type == 'MESH' and obj.data is not None and not any(m.show_viewport for m in obj.modifiers)
+
+def _has_geometry(obj):
+    # Un empty simple (repère, pivot) n'empêche pas d'instancier sa collection ; un empty qui
+    # instancie lui-même une collection, si
+    return obj.type != 'EMPTY' or obj.instance_type == 'COLLECTION'
+
+def build_instance_plan(view_layer, root_collection):
+    # {collection: [(nom du noeud, objet source, matrice monde, objet propriétaire)]}
+    # Un propriétaire est l'objet lui-même ou l'empty qui instancie une collection.
+    placements = {}
+    counts = {}
+    for collection in root_collection.children:
+        if collection.hide_viewport:
+            continue
+        entries = []
+        for obj in collection_registry.entry(view_layer, collection.name)["objects"]:
+            if _is_instanceable(obj):
+                entries.append((f"{collection.name}/{obj.name}", obj, obj.matrix_world.copy(), obj.name))
+            elif obj.instance_type == 'COLLECTION' and obj.instance_collection is not None:
+                inst_col = obj.instance_collection
+                sources = [src for src in inst_col.all_objects if not src.hide_viewport and _has_geometry(src)]
+                # Tout ou rien : un seul objet non partageable (modificateurs, courbe, texte, instance
+                # imbriquée) et l'empty reste dans l'export de la collection avec tout son contenu
+                if not sources or not all(_is_instanceable(src) for src in sources):
+                    continue
+                offset = Matrix.Translation(-inst_col.instance_offset)
+                for src in sources:
+                    entries.append((f"{collection.name}/{obj.name}/{src.name}", src,
+                                    obj.matrix_world @ offset @ src.matrix_world, obj.name))
+        placements[collection.name] = entries
+        for entry in entries:
+            key = _shared_mesh_key(entry[1])
+            counts[key] = counts.get(key, 0) + 1
+
+    shared_owners = {entry[3] for entries in placements.values() for entry in entries
+                     if counts[_shared_mesh_key(entry[1])] > 1}
+    return {name: [e for e in entries if e[3] in shared_owners] for name, entries in placements.items()}
+
+def placement_world_boxes(placements):
+    # AABB monde de chaque placement (bound_box du mesh source transformé par sa matrice)
+    corners = np.array([src.bound_box for _, src, _, _ in placements], dtype=np.float64).reshape(-1, 8, 3)
+    matrices = np.array([matrix for _, _, matrix, _ in placements], dtype=np.float64).reshape(-1, 4, 4)
+    world = np.einsum('nij,nkj->nki', matrices[:, :3, :3], corners) + matrices[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+def gltf_node_transform(matrix):
+    # Blender Z-up -> glTF/RTXPT Y-up
+    loc, rot, scale = matrix.decompose()
+    r = lambda v: round(v, 6) + 0.0
+    return (
+        [r(loc.x), r(loc.z), r(-loc.y)],
+        [r(rot.x), r(rot.z), r(-rot.y), r(rot.w)],
+        [r(scale.x), r(scale.z), r(scale.y)],
+    )
+
+def mesh_fingerprint(obj, options=()):
+    h = hashlib.sha1()
+    _hash_str(h, *_shared_mesh_key(obj), *options)
+    _hash_mesh(h, obj.data)
+    for slot in obj.material_slots:
+        if slot.material is not None:
+            _hash_material(h, slot.material)
+    return h.hexdigest()
+
+def export_shared_mesh_gltf(context, src, gltf_path, options=None, profiler=None):
+    # Exporte le mesh seul, à l'origine, via un objet temporaire qui partage ses données
+    tmp = bpy.data.objects.new(f"__rtxpt_shared_{src.data.name}", src.data)
+    context.scene.collection.objects.link(tmp)
+    try:
+        for i, slot in enumerate(src.material_slots):
+            if slot.link == 'OBJECT':
+                tmp.material_slots[i].link = 'OBJECT'
+                tmp.material_slots[i].material = slot.material
+        context.view_layer.update()
+        export_collection_gltf([tmp], gltf_path, options, profiler)
+    finally:
+        bpy.data.objects.remove(tmp, do_unlink=True)
+
+# 1quinquies. Document de scène RTXPT indexé (.scene.json)
+
+def write_json_atomic(path, data, **dump_kwargs):
+    # Fichier temporaire dans le même dossier puis os.replace : jamais de JSON à moitié écrit
+    write_json_batch([(path, data)], **dump_kwargs)
+
+def write_json_batch(items, on_staged=None, **dump_kwargs):
+    # items : [(chemin, données)] ou [(chemin, données, options json.dump propres)]. Tous les fichiers
+    # temporaires sont écrits avant le premier os.replace : une erreur de sérialisation ou
+    # d'écriture ne modifie aucun fichier. on_staged([(temporaire, destination)]) est appelé entre
+    # les deux phases.
+    staged = []
+    try:
+        for item in items:
+            path, data = item[0], item[1]
+            folder = os.path.dirname(os.path.abspath(path))
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=folder)
+            staged.append((tmp_path, path))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, **dict(dump_kwargs, **(item[2] if len(item) > 2 else {})))
+                f.flush()
+                os.fsync(f.fileno())
+        if on_staged is not None:
+            on_staged(list(staged))
+        while staged:
+            tmp_path, path = staged[0]
+            os.replace(tmp_path, path)
+            staged.pop(0)
+    except BaseException:
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+
+class SceneDocument:
+    # Vue indexée de data["models"] (chemin -> indice) et data["graph"] (nom -> noeud) :
+    # chaque fusion est en O(1), les indices de modèles restent ceux de la liste réelle
+    # et les noeuds édités à la main sont mis à jour sur place, jamais remplacés.
+
+    def __init__(self, data=None):
+        self.data = data if isinstance(data, dict) else {}
+        if not isinstance(self.data.get("models"), list):
+            self.data["models"] = []
+        if not isinstance(self.data.get("graph"), list):
+            self.data["graph"] = []
+        self._models = {}
+        for i, path in enumerate(self.data["models"]):
+            if isinstance(path, str):
+                self._models.setdefault(path, i)
+        self._nodes = {}
+        for node in self.data["graph"]:
+            if isinstance(node, dict) and "name" in node:
+                self._nodes.setdefault(node["name"], node)
+
+    @classmethod
+    def load(cls, path):
+        # Retourne (document, erreur) ; un fichier illisible donne un document vide
+        if not os.path.exists(path):
+            return cls(), None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return cls(json.load(f)), None
+        except Exception as e:
+            return cls(), e
+
+    def model_index(self, rel_model_path):
+        index = self._models.get(rel_model_path)
+        if index is None:
+            index = len(self.data["models"])
+            self.data["models"].append(rel_model_path)
+            self._models[rel_model_path] = index
+        return index
+
+    def rename_model(self, old_path, new_path):
+        # Garde l'indice : les noeuds qui pointaient vers l'ancien fichier suivent le nouveau
+        index = self._models.get(old_path)
+        if index is None or new_path in self._models:
+            return False
+        self.data["models"][index] = new_path
+        del self._models[old_path]
+        self._models[new_path] = index
+        return True
+
+    def node(self, name):
+        return self._nodes.get(name)
+
+    def merge_node(self, node_info):
+        existing_node = self._nodes.get(node_info["name"])
+        if existing_node is not None:
+            existing_node.update(node_info)
+            return existing_node
+        self.data["graph"].append(node_info)
+        self._nodes[node_info["name"]] = node_info
+        return node_info
+
+    def merge_children(self, node, children, owned_prefixes):
+        # Les enfants générés (noms préfixés) sont remplacés par la nouvelle liste, mis à jour
+        # sur place s'ils existaient ; les enfants ajoutés à la main sont conservés après eux
+        current = [c for c in node.get("children", []) if isinstance(c, dict)]
+        existing = {c.get("name"): c for c in current}
+        merged = []
+        for child in children:
+            if child["name"] in existing:
+                existing[child["name"]].update(child)
+                merged.append(existing[child["name"]])
+            else:
+                merged.append(child)
+        kept = [c for c in current if not str(c.get("name", "")).startswith(owned_prefixes)]
+        if merged or kept:
+            node["children"] = merged + kept
+        else:
+            node.pop("children", None)
+
+    def remove_nodes(self, predicate):
+        # Retire du graphe les noeuds de premier niveau dont le nom vérifie predicate
+        removed = {name for name in self._nodes if predicate(name)}
+        if removed:
+            self.data["graph"] = [n for n in self.data["graph"]
+                                  if not (isinstance(n, dict) and n.get("name") in removed)]
+            for name in removed:
+                del self._nodes[name]
+        return len(removed)
+
+    def add_node_if_missing(self, node_info):
+        if node_info["name"] not in self._nodes:
+            self.merge_node(node_info)
+
+    def save(self, path):
+        write_json_atomic(path, self.data, indent=2)
+
+# 1sexies. Texture store partagé du projet (adressé par contenu)
+
+TEXTURE_STORE_FOLDER = "Textures"
+TEXTURE_FILE_FORMATS = {'JPEG': ('JPEG', '.jpg'), 'PNG': ('PNG', '.png'), 'WEBP': ('WEBP', '.webp')}
+GLTF_IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp"}
+
+def _image_data_ext(data):
+    # Extension d'après la signature des données (images empaquetées)
+    if data.startswith(b'\x89PNG'):
+        return ".png"
+    if data.startswith(b'\xff\xd8\xff'):
+        return ".jpg"
+    if data[8:12] == b'WEBP':
+        return ".webp"
+    return None
+
+def _file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _convert_image_file(src_path, dst_path, file_format):
+    img = bpy.data.images.load(src_path, check_existing=False)
+    try:
+        img.pixels[0]  # force le chargement du buffer avant de changer de format
+        img.filepath_raw = dst_path
+        img.file_format = file_format
+        img.save()
+    finally:
+        bpy.data.images.remove(img)
+
+def iter_image_nodes(tree, seen_groups):
+    # Noeuds Image avec image d'un arbre, groupes de noeuds imbriqués compris
+    for node in tree.nodes:
+        if node.type == 'TEX_IMAGE' and node.image is not None:
+            yield node
+        elif node.type == 'GROUP' and node.node_tree is not None and node.node_tree.name not in seen_groups:
+            seen_groups.add(node.node_tree.name)
+            yield from iter_image_nodes(node.node_tree, seen_groups)
+
+class TextureStore:
+    # Models/<Project>/Textures/<sha1 source><ext> : chaque image n'est stockée (et convertie)
+    # qu'une fois pour tout le projet ; l'index mémorise les conversions d'une export à l'autre.
+    # Les clés portent sur l'image source (fichier ou données empaquetées) et le format cible :
+    # pendant l'export, les noeuds Image pointent sur la copie stockée et l'exporteur glTF se contente
+    # d'en recopier les octets. Les images sans source (générées, peintes) passent par ingest_gltf.
+
+    def __init__(self, model_root, texture_format):
+        self.folder = os.path.join(model_root, TEXTURE_STORE_FOLDER)
+        self.index_path = os.path.join(self.folder, "textures.index.json")
+        self.texture_format = texture_format
+        self.index = {}
+        self.sources = {}
+        self.image_keys = {}
+        self.stored = 0
+        self.reused = 0
+        self.stored_bytes = 0
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.index = data.get("entries", {})
+            self.sources = data.get("sources", {})
+        except Exception:
+            self.index = {}
+            self.sources = {}
+
+    def source_key(self, img):
+        # "<sha1 source>:<format>" ; None si l'image n'existe qu'en mémoire
+        pointer = img.as_pointer()
+        if pointer in self.image_keys:
+            return self.image_keys[pointer]
+        key = None
+        if img.source == 'FILE' and not img.is_dirty:
+            if img.packed_file is not None:
+                key = f"{hashlib.sha1(img.packed_file.data).hexdigest()}:{self.texture_format}"
+            else:
+                path = bpy.path.abspath(img.filepath_raw, library=img.library)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    stat = None
+                if stat is not None:
+                    # Empreinte des fichiers sources mémorisée par (mtime, taille) : pas de relecture
+                    cached = self.sources.get(path)
+                    if cached is None or cached[:2] != [stat.st_mtime_ns, stat.st_size]:
+                        cached = self.sources[path] = [stat.st_mtime_ns, stat.st_size, _file_sha1(path)]
+                    key = f"{cached[2]}:{self.texture_format}"
+        self.image_keys[pointer] = key
+        return key
+
+    def store_image(self, img):
+        # -> nom du fichier stocké, None si l'image n'a pas de source exploitable
+        key = self.source_key(img)
+        if key is None:
+            return None
+        cached = self.index.get(key)
+        if cached and os.path.isfile(os.path.join(self.folder, cached)):
+            self.reused += 1
+            return cached
+        sha = key.split(":")[0]
+        if img.packed_file is None:
+            return self._store(bpy.path.abspath(img.filepath_raw, library=img.library), sha, key)
+        data = img.packed_file.data
+        ext = _image_data_ext(data) or os.path.splitext(img.filepath_raw)[1].lower()
+        if not ext:
+            return None
+        os.makedirs(self.folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=ext, dir=self.folder)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            return self._store(tmp_path, sha, key)
+        finally:
+            os.remove(tmp_path)
+
+    def prepare_images(self, objects):
+        # -> [(noeud Image, nom stocké)] pour les matériaux des objets ; stocke les sources manquantes
+        targets = []
+        materials = {slot.material for obj in objects for slot in obj.material_slots if slot.material is not None}
+        # Groupes partagés entre matériaux : chaque noeud n'est redirigé qu'une fois
+        seen_groups = set()
+        for mat in materials:
+            if not (mat.use_nodes and mat.node_tree):
+                continue
+            for node in iter_image_nodes(mat.node_tree, seen_groups):
+                name = self.store_image(node.image)
+                if name is not None:
+                    targets.append((node, name))
+        return targets
+
+    @contextmanager
+    def redirected(self, targets):
+        # Les noeuds pointent sur des images chargées depuis le store le temps de l'export
+        loaded = {}
+        swaps = []
+        try:
+            for node, name in targets:
+                img = node.image
+                load_key = (name, img.colorspace_settings.name, img.alpha_mode)
+                if load_key not in loaded:
+                    stored = bpy.data.images.load(os.path.join(self.folder, name), check_existing=False)
+                    stored.colorspace_settings.name = img.colorspace_settings.name
+                    stored.alpha_mode = img.alpha_mode
+                    loaded[load_key] = stored
+                swaps.append((node, img))
+                node.image = loaded[load_key]
+            yield
+        finally:
+            for node, img in swaps:
+                node.image = img
+            for stored in loaded.values():
+                bpy.data.images.remove(stored)
+
+    def store_file(self, src_path):
+        sha = _file_sha1(src_path)
+        key = f"{sha}:{self.texture_format}"
+        cached = self.index.get(key)
+        if cached and os.path.isfile(os.path.join(self.folder, cached)):
+            self.reused += 1
+            return cached
+        return self._store(src_path, sha, key)
+
+    def _store(self, src_path, sha, key):
+        os.makedirs(self.folder, exist_ok=True)
+        ext = os.path.splitext(src_path)[1].lower()
+        # Sans format imposé, seules les extensions glTF sont copiées telles quelles
+        target = TEXTURE_FILE_FORMATS.get(self.texture_format)
+        if target is None and ext not in GLTF_IMAGE_EXTS:
+            target = TEXTURE_FILE_FORMATS['PNG']
+        accepted_exts = {".jpg", ".jpeg"} if target and target[1] == ".jpg" else {target[1] if target else ext}
+        if target and ext not in accepted_exts:
+            name = sha + target[1]
+            _convert_image_file(src_path, os.path.join(self.folder, name), target[0])
+        else:
+            name = sha + ext
+            shutil.copyfile(src_path, os.path.join(self.folder, name))
+        self.index[key] = name
+        self.stored += 1
+        self.stored_bytes += os.path.getsize(os.path.join(self.folder, name))
+        return name
+
+    def ingest_gltf(self, gltf_path):
+        # Déplace les images écrites à côté du .gltf dans le store et réécrit leurs URI
+        from urllib.parse import quote, unquote
+        if gltf_path.lower().endswith(".glb"):
+            return
+        with open(gltf_path, 'r', encoding='utf-8') as f:
+            gltf = json.load(f)
+        gltf_dir = os.path.dirname(gltf_path)
+        stored_names = set(self.index.values())
+        changed = False
+        for image in gltf.get("images", []):
+            uri = image.get("uri")
+            if not uri or uri.startswith("data:"):
+                continue
+            src_path = os.path.normpath(os.path.join(gltf_dir, unquote(uri)))
+            if not os.path.isfile(src_path) or os.path.dirname(src_path) == os.path.normpath(self.folder):
+                continue
+            # Copie d'une image redirigée vers le store : rien à hacher ni à convertir
+            name = os.path.basename(src_path)
+            if name not in stored_names:
+                name = self.store_file(src_path)
+            os.remove(src_path)
+            rel = os.path.relpath(os.path.join(self.folder, name), gltf_dir).replace(os.sep, "/")
+            image["uri"] = quote(rel)
+            if "mimeType" in image:
+                image["mimeType"] = {".jpg": "image/jpeg", ".png": "image/png", ".webp": "image/webp"}.get(
+                    os.path.splitext(name)[1], image["mimeType"])
+            changed = True
+        if changed:
+            write_json_atomic(gltf_path, gltf, indent=2)
+
+    def save_index(self):
+        if self.index:
+            os.makedirs(self.folder, exist_ok=True)
+            write_json_atomic(self.index_path, {"entries": self.index, "sources": self.sources}, indent=2, sort_keys=True)
+
+# 1septies. Compression géométrique (Draco via l'exporteur, gltfpack en post-traitement)
+
+GLTF_COMPONENT_SIZES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+GLTF_TYPE_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+def _gltf_local_uris(gltf, gltf_dir, keys=("buffers", "images")):
+    from urllib.parse import unquote
+    for key in keys:
+        for item in gltf.get(key, []):
+            uri = item.get("uri")
+            if uri and not uri.startswith("data:"):
+                path = os.path.normpath(os.path.join(gltf_dir, unquote(uri)))
+                # Les textures du store projet sont partagées : hors taille de la collection
+                if os.path.dirname(path) == os.path.normpath(gltf_dir):
+                    yield item, uri, path
+
+def read_gltf_json(gltf_path):
+    # .gltf : JSON brut ; .glb : en-tête de 12 octets puis premier chunk JSON
+    with open(gltf_path, 'rb') as f:
+        if f.read(4) == b'glTF':
+            f.seek(12)
+            chunk_length, _chunk_type = struct.unpack('<II', f.read(8))
+            return json.loads(f.read(chunk_length).decode('utf-8'))
+        f.seek(0)
+        return json.loads(f.read().decode('utf-8'))
+
+def gltf_asset_size(gltf_path):
+    gltf = read_gltf_json(gltf_path)
+    size = os.path.getsize(gltf_path)
+    for _, _, path in _gltf_local_uris(gltf, os.path.dirname(gltf_path)):
+        if os.path.isfile(path):
+            size += os.path.getsize(path)
+    return size
+
+def gltf_uncompressed_size(gltf_path):
+    # Taille qu'auraient les buffers sans Draco : les accessors décrivent toujours les données décodées
+    gltf = read_gltf_json(gltf_path)
+    size = os.path.getsize(gltf_path)
+    for accessor in gltf.get("accessors", []):
+        size += (accessor.get("count", 0) * GLTF_TYPE_COMPONENTS.get(accessor.get("type"), 1)
+                 * GLTF_COMPONENT_SIZES.get(accessor.get("componentType"), 4))
+    for _, _, path in _gltf_local_uris(gltf, os.path.dirname(gltf_path), keys=("images",)):
+        if os.path.isfile(path):
+            size += os.path.getsize(path)
+    return size
+
+def run_gltfpack(gltfpack_exe, gltf_path, extra_args=""):
+    import shlex
+    folder = os.path.dirname(gltf_path)
+    stem, ext = os.path.splitext(os.path.basename(gltf_path))
+    packed_path = os.path.join(folder, f"{stem}.packed{ext}")
+    cmd = [gltfpack_exe, "-i", gltf_path, "-o", packed_path] + shlex.split(extra_args)
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    if proc.returncode != 0 or not os.path.isfile(packed_path):
+        raise RuntimeError(f"gltfpack failed ({proc.returncode}): {(proc.stdout or '').strip()[-300:]}")
+    if ext.lower() == ".glb":
+        os.replace(packed_path, gltf_path)
+        return
+
+    with open(packed_path, 'r', encoding='utf-8') as f:
+        gltf = json.load(f)
+    # gltfpack nomme ses buffers d'après la sortie : on les ramène au nom de la collection
+    for item, uri, path in list(_gltf_local_uris(gltf, folder, keys=("buffers",))):
+        name = os.path.basename(path)
+        if name.startswith(f"{stem}.packed"):
+            new_name = stem + name[len(f"{stem}.packed"):]
+            os.replace(path, os.path.join(folder, new_name))
+            item["uri"] = new_name
+    write_json_atomic(gltf_path, gltf, separators=(',', ':'))
+    os.remove(packed_path)
+
+def remove_model_files(model_path):
+    # Supprime un modèle et, pour un .gltf, ses fichiers locaux (.bin, images) qu'aucun autre .gltf
+    # du dossier ne référence : les tuiles et LODs d'une collection partagent le même dossier
+    if not os.path.isfile(model_path):
+        return
+    if model_path.endswith(".gltf"):
+        folder = os.path.dirname(model_path)
+        try:
+            gltf = read_gltf_json(model_path)
+        except Exception:
+            gltf = {}
+        owned = {path for _, _, path in _gltf_local_uris(gltf, folder)}
+        if owned:
+            with os.scandir(folder) as it:
+                siblings = [item.path for item in it
+                            if item.name.endswith(".gltf") and item.path != model_path]
+            for sibling in siblings:
+                try:
+                    owned.difference_update(path for _, _, path in _gltf_local_uris(read_gltf_json(sibling), folder))
+                except Exception:
+                    continue
+        for path in owned:
+            if os.path.isfile(path):
+                os.remove(path)
+    os.remove(model_path)
+
+def remove_stale_model(model_path):
+    # Après un changement de format, supprime le modèle de l'autre format
+    stem, ext = os.path.splitext(model_path)
+    remove_model_files(stem + (".gltf" if ext.lower() == ".glb" else ".glb"))
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024.0:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024.0
+    return f"{num_bytes:.1f} GB"
+
+# 1novies. Profilage de l'export (temps, mémoire et octets écrits par étape et par collection)
+
+PROFILE_VERSION = 2
+
+def get_profile_path(assets_root, project):
+    return os.path.join(assets_root, f"{project}.export_profile.json")
+
+def _rss_sampler():
+    # Choisi une fois au chargement : psutil si installé, /proc sous Linux, sinon rien
+    try:
+        import psutil
+        process = psutil.Process()
+        return lambda: process.memory_info().rss
+    except Exception:
+        pass
+    if os.path.isfile("/proc/self/statm"):
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        def read_statm():
+            with open("/proc/self/statm", 'r') as f:
+                return int(f.read().split()[1]) * page_size
+        return read_statm
+    return lambda: None
+
+_sample_rss = _rss_sampler()
+
+def current_rss():
+    # Mémoire résidente actuelle en octets, None si indisponible
+    try:
+        return _sample_rss()
+    except Exception:
+        return None
+
+def peak_rss():
+    # Pic de mémoire résidente du processus ; ru_maxrss est en Ko sous Linux et en octets sous macOS
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+            info = psutil.Process().memory_info()
+            return getattr(info, "peak_wset", info.rss)
+        except Exception:
+            return current_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+def profile_stage(profiler, name):
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+class ExportProfiler:
+    # Les étapes ne s'imbriquent pas : la somme des étapes reste comparable au temps total.
+    # Le RSS n'est échantillonné qu'en fin d'étape (rss_end_max), le pic global vient de peak_rss().
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+        self.collections = {}
+        self.current = None
+
+    @contextmanager
+    def collection(self, name):
+        previous, self.current = self.current, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._collection(name)["seconds"] += time.perf_counter() - start
+            self.current = previous
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def _collection(self, name):
+        return self.collections.setdefault(name, {"seconds": 0.0, "bytes": 0, "stages": {}})
+
+    def record(self, name, seconds, collection=None):
+        entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "bytes": 0, "rss_end_max": 0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["rss_end_max"] = max(entry["rss_end_max"], current_rss() or 0)
+        collection = collection or self.current
+        if collection is not None:
+            stages = self._collection(collection)["stages"]
+            stages[name] = stages.get(name, 0.0) + seconds
+
+    def add_bytes(self, name, num_bytes, collection=None):
+        entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0, "bytes": 0, "rss_end_max": 0})
+        entry["bytes"] += num_bytes
+        collection = collection or self.current
+        if collection is not None:
+            self._collection(collection)["bytes"] += num_bytes
+
+    def report(self):
+        def rounded(entries):
+            return {name: dict(entry, seconds=round(entry["seconds"], 4)) for name, entry in entries.items()}
+        collections = {name: dict(entry, seconds=round(entry["seconds"], 4),
+                                  stages={k: round(v, 4) for k, v in entry["stages"].items()})
+                       for name, entry in self.collections.items()}
+        return {
+            "version": PROFILE_VERSION,
+            "total_seconds": round(time.perf_counter() - self.started, 4),
+            "peak_rss": peak_rss(),
+            "bytes_written": sum(entry["bytes"] for entry in self.stages.values()),
+            "stages": rounded(self.stages),
+            "collections": collections,
+            "slowest_collections": sorted(self.collections, key=lambda n: self.collections[n]["seconds"], reverse=True)[:10],
+        }
+
+    def summary_lines(self, limit=3):
+        report = self.report()
+        peak = f", peak {format_size(report['peak_rss'])}" if report["peak_rss"] else ""
+        lines = [f"Total {report['total_seconds']:.2f} s{peak}, {format_size(report['bytes_written'])} written"]
+        for name in sorted(self.stages, key=lambda n: self.stages[n]["seconds"], reverse=True)[:limit]:
+            lines.append(f"Stage {name}: {self.stages[name]['seconds']:.2f} s")
+        for name in report["slowest_collections"][:limit]:
+            lines.append(f"Collection {name}: {self.collections[name]['seconds']:.2f} s")
+        return lines
+
+# 1decies. Registre des collections d'EXPORT_TEST (maintenu par les handlers depsgraph et chargement)
+
+EXPORT_ROOT_NAME = "EXPORT_TEST"
+
+class CollectionRegistry:
+    # Cache des sous-collections d'EXPORT_TEST et de leur état d'export (objets visibles, objets sans
+    # matériau, "dirty" = modifiée depuis le dernier export réussi). Le panneau, l'enum et l'exporteur
+    # le lisent au lieu de rebalayer la scène ; les handlers invalident seulement ce qui a bougé.
+    # Les objets sont suivis par pointeur : un renommage ne casse pas le suivi.
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.entries = {}
+        self.names = []
+        self.enum_items = [("NONE", "None", "No collections found")]
+        self.object_owners = {}
+        self.material_owners = {}
+        self.instance_owners = {}
+        self.layer_objects = set()
+        self.view_layer_name = None
+        self.valid = False
+        self.ignoring = 0
+
+    def invalidate(self, mark_dirty=False):
+        self.valid = False
+        if mark_dirty:
+            for entry in self.entries.values():
+                entry["dirty"] = True
+
+    def refresh(self, view_layer):
+        if self.valid and self.view_layer_name == view_layer.name:
+            return
+        root = bpy.data.collections.get(EXPORT_ROOT_NAME)
+        self.layer_objects = {obj.name for obj in view_layer.objects}
+        self.view_layer_name = view_layer.name
+        previous = self.entries
+        self.entries = {}
+        self.names = []
+        if root is not None:
+            for collection in root.children:
+                self.names.append(collection.name)
+                self.entries[collection.name] = self._scan(collection, previous.get(collection.name))
+        self.enum_items = [(name, name, "") for name in self.names] or [("NONE", "None", "No collections found")]
+        self._index_owners()
+        self.valid = True
+
+    def validate(self, view_layer):
+        # Contrôle complet avant un export : structure (renommages, ajouts) et nombre d'objets
+        self.refresh(view_layer)
+        root = bpy.data.collections.get(EXPORT_ROOT_NAME)
+        if root is None or [c.name for c in root.children] != self.names:
+            self.invalidate()
+            self.refresh(view_layer)
+
+    def _scan(self, collection, previous):
+        objects = [obj for obj in collection.objects if not obj.hide_viewport and obj.name in self.layer_objects]
+        signature = (collection.hide_viewport, tuple(
+            (obj.name, tuple(slot.material.name if slot.material else "" for slot in obj.material_slots))
+            for obj in objects))
+        instanced = [src for obj in objects for src, _ in iter_instanced_objects(obj)]
+        return {
+            "collection": collection,
+            "hidden": collection.hide_viewport,
+            "objects": objects,
+            # Contenu des collections instanciées : ses modifications rendent la collection dirty
+            "instanced_objects": {src.as_pointer() for src in instanced},
+            "instanced_collections": {obj.instance_collection.name for obj in objects + instanced
+                                      if obj.instance_type == 'COLLECTION' and obj.instance_collection is not None},
+            "object_count": len(collection.objects),
+            "missing_materials": get_material_warnings(objects),
+            "materials": {slot.material.as_pointer() for obj in objects + instanced for slot in obj.material_slots
+                          if slot.material is not None},
+            "signature": signature,
+            "stale": False,
+            "dirty": previous is None or previous["dirty"] or previous["signature"] != signature,
+            # Compteur d'éditions : un export ne nettoie que les collections non retouchées depuis leur export
+            "edits": (previous["edits"] + (previous["signature"] != signature)) if previous is not None else 0,
+        }
+
+    def _index_owners(self):
+        self.object_owners = {}
+        self.material_owners = {}
+        self.instance_owners = {}
+        for name, entry in self.entries.items():
+            for obj in entry["objects"]:
+                self.object_owners.setdefault(obj.as_pointer(), set()).add(name)
+            for pointer in entry["instanced_objects"]:
+                self.object_owners.setdefault(pointer, set()).add(name)
+            for collection_name in entry["instanced_collections"]:
+                self.instance_owners.setdefault(collection_name, set()).add(name)
+            for pointer in entry["materials"]:
+                self.material_owners.setdefault(pointer, set()).add(name)
+
+    def entry(self, view_layer, name):
+        self.refresh(view_layer)
+        entry = self.entries.get(name)
+        if entry is None:
+            return None
+        try:
+            stale = entry["stale"] or len(entry["collection"].objects) != entry["object_count"]
+        except ReferenceError:
+            self.invalidate()
+            return self.entry(view_layer, name)
+        if stale:
+            entry = self.entries[name] = self._scan(entry["collection"], entry)
+            self._index_owners()
+        return entry
+
+    def dirty_names(self, view_layer):
+        self.refresh(view_layer)
+        return [name for name in self.names if self.entry(view_layer, name)["dirty"]]
+
+    def edit_marks(self, names):
+        return {name: self.entries[name]["edits"] for name in names if name in self.entries}
+
+    def mark_clean(self, marks):
+        # marks : {collection: compteur d'éditions relevé au moment de son export}
+        for name, edits in marks.items():
+            entry = self.entries.get(name)
+            if entry is not None and entry["edits"] == edits:
+                entry["dirty"] = False
+
+    @contextmanager
+    def ignoring_updates(self, view_layer):
+        # Objets temporaires, noeuds redirigés, clés précalculées : l'export modifie puis restaure la
+        # scène. Ces mises à jour sont évaluées ici par un view_layer.update() final, pendant que le
+        # registre les ignore, au lieu de l'être au prochain redraw où elles marqueraient tout dirty.
+        self.ignoring += 1
+        try:
+            yield
+        finally:
+            try:
+                view_layer.update()
+            finally:
+                self.ignoring -= 1
+
+    def _touch(self, name):
+        entry = self.entries[name]
+        entry["dirty"] = True
+        entry["edits"] += 1
+
+    def on_depsgraph_update(self, depsgraph):
+        # Retourne True si une collection d'EXPORT_TEST a pu changer
+        if self.ignoring:
+            return False
+        touched = False
+        for update in depsgraph.updates:
+            id_data = update.id
+            if isinstance(id_data, bpy.types.Object):
+                for name in self.object_owners.get(id_data.original.as_pointer(), ()):
+                    self._touch(name)
+                    touched = True
+            elif isinstance(id_data, bpy.types.Material):
+                for name in self.material_owners.get(id_data.original.as_pointer(), ()):
+                    self._touch(name)
+                    touched = True
+            elif isinstance(id_data, bpy.types.Collection):
+                # Liens d'objets, visibilité, exclusion du view layer : rescan complet au prochain accès
+                if id_data.name == EXPORT_ROOT_NAME or id_data.name in self.entries:
+                    self.invalidate()
+                    touched = True
+                    if id_data.name in self.entries:
+                        self._touch(id_data.name)
+                # Collection instanciée : objets ajoutés ou retirés de son contenu
+                for name in self.instance_owners.get(id_data.name, ()):
+                    self._touch(name)
+                    self.entries[name]["stale"] = touched = True
+            elif isinstance(id_data, bpy.types.Scene):
+                # Seul signal d'une affectation de matériau : rescan paresseux, la signature décide du dirty
+                for entry in self.entries.values():
+                    entry["stale"] = touched = True
+        return touched
+
+collection_registry = CollectionRegistry()
+
+@persistent
+def _registry_depsgraph_update(scene, depsgraph):
+    forget_vertex_weights(depsgraph)
+    if collection_registry.on_depsgraph_update(depsgraph):
+        live_sync_touch()
+
+@persistent
+def _registry_load_post(*_args):
+    collection_registry.reset()
+    forget_vertex_weights()
+    scene = bpy.context.scene
+    if scene is not None and scene.rtxpt_proj_props.live_sync:
+        live_sync_start()
+
+@persistent
+def _registry_undo_post(*_args):
+    # Les références RNA ne survivent pas à un undo et l'état restauré peut différer du dernier export
+    collection_registry.invalidate(mark_dirty=True)
+    forget_vertex_weights()
+
+# 1duodecies. Session RTXPT : l'instance lancée est réutilisée et rechargée plutôt que relancée
+
+RELOAD_PROTOCOL_VERSION = 1
+
+def get_reload_path(json_path):
+    # <Project>.scene.json -> <Project>.reload.json, à côté de la scène
+    stem = json_path[:-len(".scene.json")] if json_path.endswith(".scene.json") else os.path.splitext(json_path)[0]
+    return stem + ".reload.json"
+
+class RTXPTSession:
+    # Suit le processus RTXPT lancé par Blender. Protocole de rechargement : <Project>.reload.json est
+    # réécrit atomiquement (nouveau mtime, "sequence" croissant) avec la scène et les modèles/matériaux
+    # modifiés ; son chemin est passé au processus dans la variable d'environnement RTXPT_RELOAD_FILE.
+
+    def __init__(self):
+        self.proc = None
+        self.exe = None
+        self.scene = None
+        self.sequence = 0
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def owns(self, scene):
+        return self.alive() and self.scene == os.path.abspath(scene)
+
+    def launch(self, exe, scene):
+        env = dict(os.environ, RTXPT_RELOAD_FILE=get_reload_path(scene))
+        self.proc = subprocess.Popen([exe, "--scene", scene], env=env)
+        self.exe = exe
+        self.scene = scene
+
+    def request_reload(self, models=(), materials=()):
+        self.sequence += 1
+        write_json_atomic(get_reload_path(self.scene), {
+            "version": RELOAD_PROTOCOL_VERSION,
+            "sequence": self.sequence,
+            "pid": self.proc.pid,
+            # Chemins relatifs au dossier Assets, celui de la scène
+            "scene": os.path.basename(self.scene),
+            "models": sorted(models),
+            "materials": sorted(materials),
+            "time": time.time()
+        }, indent=2)
+
+    def stop(self, timeout=5.0):
+        if self.alive():
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.proc = None
+
+    def sync(self, exe, scene, mode, models=(), materials=()):
+        # mode : RELOAD (réutilise l'instance vivante), RESTART (ferme puis relance), NEW (toujours une
+        # nouvelle instance, l'ancienne n'est plus suivie). -> "launched", "restarted" ou "reloaded"
+        exe, scene = os.path.abspath(exe), os.path.abspath(scene)
+        if mode == 'RELOAD' and self.alive() and self.exe == exe and self.scene == scene:
+            self.request_reload(models, materials)
+            return "reloaded"
+        restarted = mode != 'NEW' and self.alive()
+        if restarted:
+            self.stop()
+        self.launch(exe, scene)
+        return "restarted" if restarted else "launched"
+
+rtxpt_session = RTXPTSession()
 
 # 2. Préférences d'addon
 
@@ -51,14 +1852,67 @@ class RTXPT_AddonPreferences(bpy.types.AddonPreferences):
         subtype='FILE_PATH',
         default=""
     )
+    rtxpt_session_mode: EnumProperty(
+        name="RTXPT Session",
+        description="What happens to the RTXPT instance started by a previous export",
+        items=[
+            ('RELOAD', "Reuse and Reload", "Keep the running instance and ask it to reload the changed scene, models and materials"),
+            ('RESTART', "Restart", "Close the running instance, then launch a new one"),
+            ('NEW', "New Instance", "Always launch a new instance"),
+        ],
+        default='RESTART'
+    )
+    parallel_export: BoolProperty(
+        name="Parallel Collection Export",
+        description="Export collections in background Blender worker processes",
+        default=False
+    )
+    worker_count: IntProperty(
+        name="Worker Processes",
+        default=max(1, min(8, (os.cpu_count() or 2) - 1)),
+        min=1,
+        max=256
+    )
+    blender_exe: StringProperty(
+        name="Blender Executable (workers)",
+        description="Blender binary used for worker processes, defaults to the running Blender",
+        subtype='FILE_PATH',
+        default=""
+    )
+
+    gltfpack_exe: StringProperty(
+        name="gltfpack Path",
+        description="gltfpack executable used by the 'Compression post gltfpack' option",
+        subtype='FILE_PATH',
+        default=""
+    )
+    gltfpack_args: StringProperty(
+        name="gltfpack Arguments",
+        description="Extra command-line arguments passed to gltfpack (e.g. -cc, -si 0.5)",
+        default=""
+    )
 
     def draw(self, context):
         layout = self.layout
         layout.label(text="Global RTXPT Settings")
         layout.prop(self, "rtxpt_exe")
+        layout.prop(self, "rtxpt_session_mode")
+        layout.prop(self, "parallel_export")
+        col = layout.column()
+        col.enabled = self.parallel_export
+        col.prop(self, "worker_count")
+        col.prop(self, "blender_exe")
+        layout.prop(self, "gltfpack_exe")
+        layout.prop(self, "gltfpack_args")
 
 # 3. Propriétés de projet et caméra
 
+def _live_sync_update(self, context):
+    if self.live_sync:
+        live_sync_start()
+    else:
+        live_sync_stop()
+
 class RTXPT_Proj_Props(bpy.types.PropertyGroup):
     assets_root: StringProperty(
         name="RTXPT 'Assets' Folder",
@@ -69,6 +1923,26 @@ class RTXPT_Proj_Props(bpy.types.PropertyGroup):
         name="Project Name",
         default="TestProject"
     )
+    force_full_export: BoolProperty(
+        name="Force Full Export",
+        description="Re-export every collection, ignoring the incremental export manifest",
+        default=False
+    )
+    live_sync: BoolProperty(
+        name="Live Sync",
+        description="Re-export edited collections automatically once the scene has been quiet for the sync delay",
+        default=False,
+        update=_live_sync_update
+    )
+    live_sync_delay: FloatProperty(
+        name="Sync Delay",
+        description="Seconds without edits before the modified collections are re-exported",
+        subtype='TIME',
+        unit='TIME_ABSOLUTE',
+        default=1.5,
+        min=0.2,
+        soft_max=10.0
+    )
     selected_node: EnumProperty(
         name="Selected Node",
         description="Select collection node to modify",
@@ -129,6 +2003,17 @@ class RTXPT_Camera_Props(bpy.types.PropertyGroup):
         default=6.0
     )
 
+class RTXPT_ExportCollectionStatus(bpy.types.PropertyGroup):
+    status: StringProperty(name="Status", default="")
+
+class RTXPT_ExportProgress_Props(bpy.types.PropertyGroup):
+    running: BoolProperty(name="Export Running", default=False)
+    progress: FloatProperty(name="Progress", subtype='PERCENTAGE', min=0.0, max=100.0, default=0.0)
+    status: StringProperty(name="Status", default="")
+    collections: bpy.props.CollectionProperty(type=RTXPT_ExportCollectionStatus)
+    profile_summary: StringProperty(name="Last Export Profile", default="")
+    live_sync_status: StringProperty(name="Live Sync Status", default="")
+
 # 3bis. Propriétés avancées d’export inspirées glTF-Blender
 
 class RTXPT_Export_Advanced_Props(bpy.types.PropertyGroup):
@@ -151,6 +2036,12 @@ class RTXPT_Export_Advanced_Props(bpy.types.PropertyGroup):
         ],
         default='AUTO'
     )
+    use_texture_store: BoolProperty(
+        name="Textures partagées (store projet)",
+        description="Stocker chaque texture une seule fois dans Models/<Projet>/Textures, "
+                    "indexée par contenu, au lieu d'une copie par collection",
+        default=True
+    )
     use_draco: BoolProperty(
         name="Compression Draco", default=False
     )
@@ -160,6 +2051,19 @@ class RTXPT_Export_Advanced_Props(bpy.types.PropertyGroup):
     export_animations: BoolProperty(
         name="Exporter animations", default=True
     )
+    bake_animations: BoolProperty(
+        name="Précalculer les animations",
+        description="Sample each action's F-curves once over the scene frame range and export reduced "
+                    "linear keys instead of letting the glTF exporter sample every frame",
+        default=True
+    )
+    animation_tolerance: FloatProperty(
+        name="Tolérance animation",
+        description="Maximum deviation allowed when removing keys (scene units, radians or scale)",
+        default=0.001,
+        min=0.0,
+        precision=4
+    )
     export_selection_only: BoolProperty(
         name="Sélection uniquement", default=False
     )
@@ -172,6 +2076,59 @@ class RTXPT_Export_Advanced_Props(bpy.types.PropertyGroup):
     use_gltfpack_compression: BoolProperty(
         name="Compression post gltfpack", default=False
     )
+    use_lods: BoolProperty(
+        name="Générer des LODs",
+        description="Exporter des variantes décimées de chaque collection à côté du modèle de base",
+        default=False
+    )
+    lod_ratios: StringProperty(
+        name="Ratios LOD",
+        description="Ratios de décimation par niveau, séparés par des virgules (ex. 0.5, 0.25, 0.1)",
+        default="0.5, 0.25"
+    )
+    lod_screen_sizes: StringProperty(
+        name="Seuils écran LOD",
+        description="Taille écran (fraction de la hauteur) en dessous de laquelle chaque LOD est utilisé ; "
+                    "un seuil manquant vaut la moitié du précédent",
+        default="0.5, 0.25"
+    )
+    export_bounding_spheres: BoolProperty(
+        name="Sphères englobantes",
+        description="Écrire aussi une sphère englobante (boundingSphere) dans chaque noeud, en plus de l'AABB",
+        default=False
+    )
+    use_instancing: BoolProperty(
+        name="Instancier les meshes partagés",
+        description="Exporter une seule fois les meshes partagés (linked duplicates, instances de collection) "
+                    "et créer un noeud de graphe par placement",
+        default=False
+    )
+    use_tiling: BoolProperty(
+        name="Découper en tuiles",
+        description="Découper les grosses collections en tuiles spatiales : un modèle et un noeud enfant par tuile",
+        default=False
+    )
+    tile_mode: EnumProperty(
+        name="Découpage",
+        items=[
+            ('GRID', "Grille", "Grille uniforme dans le plan XY"),
+            ('OCTREE', "Octree", "Subdivision en octants jusqu'au nombre d'objets maximum par tuile"),
+        ],
+        default='GRID'
+    )
+    tile_size: FloatProperty(
+        name="Taille de tuile",
+        description="Côté d'une case de la grille",
+        subtype='DISTANCE',
+        default=100.0,
+        min=0.01
+    )
+    tile_max_objects: IntProperty(
+        name="Objets max par tuile",
+        description="Les collections plus petites ne sont pas découpées ; en octree, capacité d'une feuille",
+        default=256,
+        min=1
+    )
 
 
 def ensure_correct_extension(filepath, export_format):
@@ -194,20 +2151,110 @@ class RTXPT_PT_ExportPanel(bpy.types.Panel):
         layout = self.layout
         layout.prop(props, "assets_root")
         layout.prop(props, "project_name")
-
-        root_collection = bpy.data.collections.get("EXPORT_TEST")
-        if root_collection:
+        layout.prop(props, "force_full_export")
+        progress = context.window_manager.rtxpt_export_progress
+        row = layout.row(align=True)
+        row.prop(props, "live_sync", icon="FILE_REFRESH")
+        if props.live_sync:
+            row.prop(props, "live_sync_delay", text="Delay")
+            if progress.live_sync_status:
+                layout.label(text=progress.live_sync_status)
+
+        collection_registry.refresh(context.view_layer)
+        if collection_registry.names:
             layout.label(text="Select node to modify:")
             layout.prop(props, "selected_node", text="Node")
 
             selected_name = props.selected_node
-            col = root_collection.children.get(selected_name)
-            if col:
+            entry = collection_registry.entry(context.view_layer, selected_name)
+            if entry:
                 layout.label(text=f"Edit properties for {selected_name}:")
                 layout.prop(props, "node_translation", text="Translation")
                 layout.prop(props, "node_scale", text="Scale")
+                missing = len(entry["missing_materials"])
+                layout.label(text=f"{len(entry['objects'])} visible objects, {missing} without material",
+                             icon="ERROR" if missing else "CHECKMARK")
 
         layout.operator("rtxpt.project_export", icon="EXPORT")
+        layout.operator("rtxpt.project_export_modal", icon="TIME")
+        project = props.project_name.strip()
+        if project and not progress.running and \
+                os.path.isfile(get_journal_path(bpy.path.abspath(props.assets_root), project)):
+            box = layout.box()
+            box.label(text="Previous export was interrupted", icon="ERROR")
+            row = box.row(align=True)
+            row.operator("rtxpt.project_export", text="Resume Export", icon="RECOVER_LAST").resume = True
+            row.operator("rtxpt.project_export_modal", text="Resume (Background)", icon="TIME").resume = True
+        if rtxpt_session.alive():
+            row = layout.row()
+            row.label(text=f"RTXPT running (pid {rtxpt_session.proc.pid})", icon="PLAY")
+            row.operator("rtxpt.session_stop", text="", icon="CANCEL")
+
+        if progress.running:
+            box = layout.box()
+            if hasattr(box, "progress"):
+                box.progress(factor=progress.progress / 100.0, type='BAR', text=progress.status)
+            else:
+                box.label(text=progress.status)
+                row = box.row()
+                row.enabled = False
+                row.prop(progress, "progress", slider=True)
+            for item in progress.collections:
+                box.label(text=f"{item.name}: {item.status}")
+            box.label(text="Press Esc to cancel", icon="CANCEL")
+        elif progress.profile_summary:
+            box = layout.box()
+            box.label(text="Last export profile", icon="TIME")
+            for line in progress.profile_summary.splitlines():
+                box.label(text=line)
+
+class RTXPT_PT_ExportAdvancedPanel(bpy.types.Panel):
+    bl_label = "Advanced Export Options"
+    bl_idname = "RTXPT_PT_export_advanced_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "RTXPT"
+    bl_parent_id = "RTXPT_PT_proj_export_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        adv = context.scene.rtxpt_export_advanced_props
+        layout = self.layout
+        layout.prop(adv, "export_format")
+        layout.prop(adv, "export_textures")
+        col = layout.column()
+        col.enabled = adv.export_textures
+        col.prop(adv, "texture_format")
+        row = col.row()
+        row.enabled = adv.export_format != 'GLB'
+        row.prop(adv, "use_texture_store")
+        layout.prop(adv, "use_draco")
+        row = layout.row()
+        row.enabled = adv.use_draco
+        row.prop(adv, "draco_level")
+        layout.prop(adv, "use_gltfpack_compression")
+        layout.prop(adv, "use_lods")
+        col = layout.column()
+        col.enabled = adv.use_lods
+        col.prop(adv, "lod_ratios")
+        col.prop(adv, "lod_screen_sizes")
+        layout.prop(adv, "export_animations")
+        col = layout.column()
+        col.enabled = adv.export_animations
+        col.prop(adv, "bake_animations")
+        row = col.row()
+        row.enabled = adv.bake_animations
+        row.prop(adv, "animation_tolerance")
+        layout.prop(adv, "export_bounding_spheres")
+        layout.prop(adv, "use_instancing")
+        layout.prop(adv, "use_tiling")
+        col = layout.column()
+        col.enabled = adv.use_tiling
+        col.prop(adv, "tile_mode")
+        row = col.row()
+        row.enabled = adv.tile_mode == 'GRID'
+        row.prop(adv, "tile_size")
+        col.prop(adv, "tile_max_objects")
 
 class RTXPT_PT_CameraPanel(bpy.types.Panel):
     bl_label = "RTXPT Camera Settings"
@@ -241,6 +2288,7 @@ class RTXPT_PT_MaterialEditPanel(bpy.types.Panel):
         layout = self.layout
         props = context.scene.rtxpt_material_edit_props
 
+        layout.prop(props, "assets_root")
         layout.prop(props, "material_name")
         layout.prop(props, "exclude_from_nee")
 
@@ -248,231 +2296,1258 @@ class RTXPT_PT_MaterialEditPanel(bpy.types.Panel):
         row.operator("rtxpt.material_edit_load", text="Load Material JSON")
         row.operator("rtxpt.material_edit_save", text="Save Material JSON")
 
-# 5. Exporteur principal et opérateurs edits matière
-
-class RTXPT_OT_ProjectExport(bpy.types.Operator):
-    bl_idname = "rtxpt.project_export"
-    bl_label = "Export RTXPT Project"
-    bl_options = {"REGISTER"}
-
-    def execute(self, context):
-        props = context.scene.rtxpt_proj_props
-        cam_props = context.scene.rtxpt_camera_props
-        addon_prefs = context.preferences.addons[__name__].preferences
-
-        project = props.project_name.strip()
-        if not project:
-            self.report({"ERROR"}, "Please enter a valid project name.")
-            return {"CANCELLED"}
+class RTXPT_PT_MaterialBulkPanel(bpy.types.Panel):
+    bl_label = "Bulk Edit"
+    bl_idname = "RTXPT_PT_material_bulk_panel"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "RTXPT"
+    bl_parent_id = "RTXPT_PT_material_edit_panel"
+    bl_options = {'DEFAULT_CLOSED'}
 
-        assets_root = bpy.path.abspath(props.assets_root)
-        model_root = os.path.join(assets_root, "Models", project)
-        os.makedirs(model_root, exist_ok=True)
-        json_path = os.path.join(assets_root, f"{project}.scene.json")
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.rtxpt_material_edit_props
+        layout.prop(props, "filter_pattern")
+        layout.prop(props, "filter_collection")
+        layout.prop(props, "bulk_field")
+        layout.prop(props, "filter_value")
+        layout.prop(props, "bulk_value")
+
+        targets = bulk_material_targets(context)
+        box = layout.box()
+        box.label(text=f"{len(targets)} matching material files")
+        for name in targets[:5]:
+            box.label(text=name)
+        if len(targets) > 5:
+            box.label(text=f"... and {len(targets) - 5} more")
+        layout.operator("rtxpt.material_bulk_apply", icon="CHECKMARK")
 
-        root_collection = bpy.data.collections.get("EXPORT_TEST")
-        if not root_collection:
-            self.report({"ERROR"}, "❌ Collection 'EXPORT_TEST' not found in the Blender scene.")
-            return {"CANCELLED"}
+# 5. Exporteur principal et opérateurs edits matière
 
-        warning_objs = []
-        if os.path.exists(json_path):
+# Noms de sockets du Principled BSDF selon les versions (4.x en premier, puis 2.8-3.x)
+PRINCIPLED_SOCKETS = {
+    "base_color": ("Base Color",),
+    "metallic": ("Metallic",),
+    "roughness": ("Roughness",),
+    "ior": ("IOR",),
+    "alpha": ("Alpha",),
+    "emission_color": ("Emission Color", "Emission"),
+    "emission_strength": ("Emission Strength",),
+    "transmission": ("Transmission Weight", "Transmission"),
+    "specular_tint": ("Specular Tint",),
+}
+MATERIAL_INDEX_NAME = "materials.index.json"
+
+def find_principled_bsdf(mat):
+    # Le BSDF branché sur la sortie active, sinon le premier Principled de l'arbre
+    if mat.node_tree is None or (bpy.app.version < (5, 0, 0) and not mat.use_nodes):
+        return None
+    nodes = mat.node_tree.nodes
+    for node in nodes:
+        if node.type == 'OUTPUT_MATERIAL' and node.is_active_output:
+            links = node.inputs["Surface"].links
+            if links and links[0].from_node.type == 'BSDF_PRINCIPLED':
+                return links[0].from_node
+    return next((node for node in nodes if node.type == 'BSDF_PRINCIPLED'), None)
+
+def principled_input(bsdf, key, socket_type=None):
+    for name in PRINCIPLED_SOCKETS[key]:
+        socket = bsdf.inputs.get(name)
+        if socket is not None and (socket_type is None or socket.type == socket_type):
+            return socket
+    return None
+
+def principled_value(bsdf, key, default, socket_type=None):
+    # Comme l'exporteur glTF : une entrée texturée donne un facteur neutre (1.0 / blanc)
+    socket = principled_input(bsdf, key, socket_type) if bsdf is not None else None
+    if socket is None:
+        return default
+    if socket.is_linked:
+        return [1.0, 1.0, 1.0] if isinstance(default, list) else 1.0
+    value = socket.default_value
+    return [round(float(c), 6) for c in value[:3]] if isinstance(default, list) else round(float(value), 6)
+
+def material_node_properties(mat):
+    # Propriétés RTXPT portées par le noeud de la collection (et non par le .material.json)
+    props = {}
+    if "ignore_neeshadowray" in mat:
+        props["ignore_neeshadowray"] = bool(mat["ignore_neeshadowray"])
+    if "exclude_from_nee" in mat and bool(mat["exclude_from_nee"]):
+        props["ExcludeFromNEE"] = True
+    return props
+
+def build_material_json(mat):
+    bsdf = find_principled_bsdf(mat)
+    if bsdf is not None:
+        base_color = principled_value(bsdf, "base_color", [1.0, 1.0, 1.0])
+        metallic = principled_value(bsdf, "metallic", 0.0)
+        roughness = principled_value(bsdf, "roughness", 0.5)
+    else:
+        base_color = safe_color(getattr(mat, "diffuse_color", (1.0, 1.0, 1.0)))
+        metallic = round(float(getattr(mat, "metallic", 0.0)), 6)
+        roughness = round(float(getattr(mat, "roughness", 0.5)), 6)
+    normal_scale = 1.0
+    normal_links = bsdf.inputs["Normal"].links if bsdf is not None else ()
+    if normal_links and normal_links[0].from_node.type == 'NORMAL_MAP':
+        normal_scale = round(float(normal_links[0].from_node.inputs["Strength"].default_value), 6)
+
+    return {
+        "AlphaCutoff": round(float(getattr(mat, "alpha_threshold", 0.5)), 6),
+        "BaseOrDiffuseColor": base_color,
+        "DiffuseTransmissionFactor": getattr(mat, "diffuse_transmission_factor", 0.0),
+        "EmissiveColor": principled_value(bsdf, "emission_color", [0.0, 0.0, 0.0]),
+        "EmissiveIntensity": principled_value(bsdf, "emission_strength", 1.0),
+        "EnableAlphaTesting": getattr(mat, "blend_method", 'OPAQUE') == 'CLIP',
+        "EnableAsAnalyticLightProxy": False,
+        "EnableBaseTexture": True,
+        "EnableEmissiveTexture": True,
+        "EnableNormalTexture": True,
+        "EnableOcclusionRoughnessMetallicTexture": True,
+        "EnableTransmission": True,
+        "EnableTransmissionTexture": True,
+        "ExcludeFromNEE": ("exclude_from_nee" in mat and bool(mat["exclude_from_nee"])),
+        "IoR": principled_value(bsdf, "ior", 2.0),
+        "Metalness": metallic,
+        "MetalnessInRedChannel": False,
+        "NestedPriority": getattr(mat, "nested_priority", 14),
+        "NormalTextureScale": normal_scale,
+        "Opacity": principled_value(bsdf, "alpha", 1.0),
+        "PSDDominantDeltaLobe": 0,
+        "PSDExclude": False,
+        "Roughness": roughness,
+        "ShadowNoLFadeout": 0.0,
+        "SpecularColor": principled_value(bsdf, "specular_tint", [0.0, 0.0, 0.0], socket_type='RGBA'),
+        "ThinSurface": getattr(mat, "thin_surface", getattr(mat, "thickness_mode", None) == 'SLAB'),
+        "TransmissionFactor": principled_value(bsdf, "transmission", 0.0),
+        "UseSpecularGlossModel": False,
+        "VolumeAttenuationColor": [1.0, 1.0, 1.0],
+        "VolumeAttenuationDistance": 3.4028234663852886e+38,
+        "version": 1,
+    }
+
+class MaterialStore:
+    # Assets/Materials/<nom>.material.json : chaque matériau est extrait une fois par export,
+    # le fichier n'est réécrit que si l'empreinte du contenu a changé (index materials.index.json).
+    # Une retouche à la main du fichier est donc conservée tant que le matériau Blender ne change pas.
+    # L'index garde aussi les valeurs générées des champs de l'éditeur (MATERIAL_BULK_FIELDS) : à la
+    # réécriture, un champ dont le fichier diffère de la dernière valeur générée a été édité et garde
+    # la valeur du fichier, sinon la valeur Blender l'emporte.
+
+    def __init__(self, assets_root):
+        self.folder = os.path.join(assets_root, "Materials")
+        self.index_path = os.path.join(self.folder, MATERIAL_INDEX_NAME)
+        self.cache = {}
+        self.written = 0
+        self.unchanged = 0
+        self.written_names = []
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f).get("entries", {})
+        except Exception:
+            self.index = {}
+
+    def extract(self, mat):
+        key = mat.as_pointer()
+        if key not in self.cache:
+            data = build_material_json(mat)
+            self.cache[key] = {
+                "name": mat.name,
+                "data": data,
+                "node_properties": material_node_properties(mat),
+                "fingerprint": hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest(),
+            }
+        return self.cache[key]
+
+    def stage(self, materials):
+        # -> [(chemin, données[, options])] à écrire avec write_json_batch, index compris
+        os.makedirs(self.folder, exist_ok=True)
+        items = []
+        for mat in materials:
+            entry = self.extract(mat)
+            path = os.path.join(self.folder, f"{entry['name']}.material.json")
+            previous = self.index.get(entry["name"])
+            if not isinstance(previous, dict):
+                # Index d'avant les valeurs générées : on ne sait pas ce qui a été édité
+                previous = {"fingerprint": None, "editor": None}
+            if previous["fingerprint"] == entry["fingerprint"] and os.path.isfile(path):
+                self.unchanged += 1
+                continue
+            items.append((path, self.merge_existing(path, entry["data"], previous["editor"])))
+            self.index[entry["name"]] = {
+                "fingerprint": entry["fingerprint"],
+                "editor": {k: entry["data"][k] for k in material_editor_fields() if k in entry["data"]},
+            }
+            self.written += 1
+            self.written_names.append(entry["name"])
+        if items:
+            items.append((self.index_path, {"entries": self.index}, {"sort_keys": True}))
+        return items
+
+    def merge_existing(self, path, data, generated):
+        # generated : valeurs des champs de l'éditeur au dernier export (None si inconnues)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            return data
+        edited = {}
+        for k in material_editor_fields():
+            if k not in existing:
+                continue
+            if generated is None or k not in generated or existing[k] != generated[k]:
+                edited[k] = existing[k]
+        return dict(data, **edited)
+
+# Champs booléens des .material.json modifiables en masse
+MATERIAL_BULK_FIELDS = [
+    ('ExcludeFromNEE', "Exclude From NEE", "Exclure le matériau du next event estimation"),
+    ('ThinSurface', "Thin Surface", "Surface fine (pas de volume)"),
+    ('EnableAlphaTesting', "Alpha Testing", "Découpe alpha"),
+    ('PSDExclude', "PSD Exclude", "Exclure du path space decomposition"),
+    ('EnableAsAnalyticLightProxy', "Analytic Light Proxy", "Utiliser comme proxy de lumière analytique"),
+]
+
+def material_editor_fields():
+    return [field for field, _, _ in MATERIAL_BULK_FIELDS]
+
+class MaterialIndex:
+    # Index en mémoire de Assets/Materials/*.material.json, construit à la première lecture.
+    # Le mtime du dossier signale ajouts, suppressions et remplacements atomiques ; refresh(deep=True)
+    # compare aussi (mtime, taille) de chaque fichier pour les éditions en place. Seuls les fichiers
+    # modifiés sont relus.
+
+    SUFFIX = ".material.json"
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.entries = {}
+        self.folder_mtime = None
+
+    def refresh(self, deep=False):
+        try:
+            folder_mtime = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            self.entries = {}
+            self.folder_mtime = None
+            return
+        if folder_mtime == self.folder_mtime and not deep:
+            return
+        entries = {}
+        with os.scandir(self.folder) as it:
+            for item in it:
+                if not item.name.endswith(self.SUFFIX) or not item.is_file():
+                    continue
+                name = item.name[:-len(self.SUFFIX)]
+                stat = item.stat()
+                entry = self.entries.get(name)
+                if entry is None or entry["stat"] != (stat.st_mtime_ns, stat.st_size):
+                    try:
+                        with open(item.path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                    except Exception:
+                        continue
+                    entry = {"path": item.path, "stat": (stat.st_mtime_ns, stat.st_size), "data": data}
+                entries[name] = entry
+        self.entries = entries
+        self.folder_mtime = folder_mtime
+
+    def get(self, name):
+        self.refresh()
+        entry = self.entries.get(name)
+        return entry["data"] if entry else None
+
+    def load(self, name):
+        # Relecture d'un seul fichier si son (mtime, taille) a changé : une édition en place
+        # ne modifie pas le mtime du dossier
+        path = os.path.join(self.folder, name + self.SUFFIX)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.entries.pop(name, None)
+            return None
+        entry = self.entries.get(name)
+        if entry is None or entry["stat"] != (stat.st_mtime_ns, stat.st_size):
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
+                with open(path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
-                    if "models" not in data:
-                        data["models"] = []
-                    if "graph" not in data:
-                        data["graph"] = []
-            except Exception as e:
-                self.report({"WARNING"}, f"Failed to load existing JSON, creating new one: {e}")
-                data = {"models": [], "graph": []}
-        else:
-            data = {"models": [], "graph": []}
-
-        new_models = []
-        new_graph = []
-
-        selected_node_name = props.selected_node
-        for i, collection in enumerate(root_collection.children):
-            if collection.hide_viewport:
+            except (OSError, ValueError):
+                return None
+            entry = self.entries[name] = {"path": path, "stat": (stat.st_mtime_ns, stat.st_size), "data": data}
+        return entry["data"]
+
+    def filter(self, pattern="", names=None, field=None, value=None):
+        # pattern : motif fnmatch insensible à la casse ; names : matériaux autorisés ; value : None = tous
+        self.refresh()
+        pattern = pattern.strip().lower()
+        result = []
+        for name, entry in self.entries.items():
+            if pattern and not fnmatch.fnmatchcase(name.lower(), pattern):
                 continue
-
-            visible_objects = [obj for obj in collection.objects if not obj.hide_viewport and obj.name in context.view_layer.objects]
-            if not visible_objects:
+            if names is not None and name not in names:
                 continue
+            if value is not None and bool(entry["data"].get(field, False)) != value:
+                continue
+            result.append(name)
+        return sorted(result)
+
+    def write(self, changes):
+        # changes : {nom: {champ: valeur}} -> une seule passe d'écriture atomique
+        self.refresh(deep=True)
+        items = []
+        for name, fields in changes.items():
+            entry = self.entries.get(name)
+            if entry is None:
+                raise KeyError(f"Material file not found: {name}{self.SUFFIX}")
+            items.append((entry["path"], dict(entry["data"], **fields)))
+        write_json_batch(items, indent=2)
+        for path, data in items:
+            stat = os.stat(path)
+            name = os.path.basename(path)[:-len(self.SUFFIX)]
+            self.entries[name] = {"path": path, "stat": (stat.st_mtime_ns, stat.st_size), "data": data}
+        self.folder_mtime = os.stat(self.folder).st_mtime_ns
+        return len(items)
+
+_material_indexes = {}
+
+def get_material_index(assets_root):
+    folder = os.path.join(assets_root, "Materials")
+    if folder not in _material_indexes:
+        _material_indexes[folder] = MaterialIndex(folder)
+    return _material_indexes[folder]
+
+def get_material_assets_root(context):
+    # Dossier Assets de l'éditeur de matériaux, sinon celui du projet
+    props = context.scene.rtxpt_material_edit_props
+    return bpy.path.abspath(props.assets_root or context.scene.rtxpt_proj_props.assets_root)
+
+def collection_material_names(context, collection_name):
+    entry = collection_registry.entry(context.view_layer, collection_name)
+    if entry is None:
+        return set()
+    return {slot.material.name for obj in entry["objects"] for slot in obj.material_slots if slot.material is not None}
+
+_material_filter_items = []
+
+def get_material_filter_collections(self, context):
+    # Liste gardée en module : Blender exige que les items restent référencés
+    collection_registry.refresh((context or bpy.context).view_layer)
+    _material_filter_items[:] = [('ALL', "All Collections", "")] + [(n, n, "") for n in collection_registry.names]
+    return _material_filter_items
+
+def bulk_material_targets(context):
+    props = context.scene.rtxpt_material_edit_props
+    index = get_material_index(get_material_assets_root(context))
+    names = None if props.filter_collection in ('ALL', '') else collection_material_names(context, props.filter_collection)
+    value = {'ANY': None, 'ON': True, 'OFF': False}[props.filter_value]
+    return index.filter(props.filter_pattern, names, props.bulk_field, value)
+
+def get_addon_prefs(context):
+    addon = context.preferences.addons.get(__name__)
+    return addon.preferences if addon else None
+
+def get_export_settings(context):
+    # Réglages d'export lus depuis la scène et les préférences, sous forme de dict
+    # pour que l'API headless puisse les surcharger sans passer par l'UI.
+    props = context.scene.rtxpt_proj_props
+    cam_props = context.scene.rtxpt_camera_props
+    adv = context.scene.rtxpt_export_advanced_props
+    prefs = get_addon_prefs(context)
+    return {
+        "assets_root": bpy.path.abspath(props.assets_root),
+        "project": props.project_name.strip(),
+        "force_full_export": props.force_full_export,
+        "selected_node": props.selected_node,
+        "node_translation": list(props.node_translation),
+        "node_scale": props.node_scale,
+        "camera": {
+            "translation": list(cam_props.translation),
+            "rotation": list(cam_props.rotation),
+            "verticalFov": cam_props.vertical_fov,
+            "zNear": cam_props.z_near,
+            "exposureValue": cam_props.exposure_value,
+            "enableAutoExposure": cam_props.enable_auto_exposure,
+            "exposureCompensation": cam_props.exposure_compensation,
+            "exposureValueMin": cam_props.exposure_value_min,
+            "exposureValueMax": cam_props.exposure_value_max
+        },
+        "rtxpt_exe": bpy.path.abspath(prefs.rtxpt_exe) if prefs and prefs.rtxpt_exe else "",
+        "launch_rtxpt": True,
+        "rtxpt_session_mode": prefs.rtxpt_session_mode if prefs else 'RESTART',
+        "parallel_export": prefs.parallel_export if prefs else False,
+        "worker_count": prefs.worker_count if prefs else 1,
+        "blender_exe": bpy.path.abspath(prefs.blender_exe) if prefs and prefs.blender_exe else bpy.app.binary_path,
+        "use_instancing": adv.use_instancing,
+        "use_tiling": adv.use_tiling,
+        "tile_mode": adv.tile_mode,
+        "tile_size": adv.tile_size,
+        "tile_max_objects": adv.tile_max_objects,
+        "bounding_spheres": adv.export_bounding_spheres,
+        "use_lods": adv.use_lods,
+        "lod_ratios": adv.lod_ratios,
+        "lod_screen_sizes": adv.lod_screen_sizes,
+        "export_format": adv.export_format,
+        "export_textures": adv.export_textures,
+        "texture_format": adv.texture_format,
+        "use_texture_store": adv.use_texture_store,
+        "use_draco": adv.use_draco,
+        "draco_level": adv.draco_level,
+        "export_animations": adv.export_animations,
+        "bake_animations": adv.bake_animations,
+        "animation_tolerance": adv.animation_tolerance,
+        "frame_range": [context.scene.frame_start, context.scene.frame_end, context.scene.frame_step],
+        "use_gltfpack": adv.use_gltfpack_compression,
+        "gltfpack_exe": bpy.path.abspath(prefs.gltfpack_exe) if prefs and prefs.gltfpack_exe else "",
+        "gltfpack_args": prefs.gltfpack_args if prefs else "",
+        "only_collections": None,
+        "resume": False,
+    }
+
+class ProjectExportJob:
+    # Export découpé en étapes (prepare / process_collection / export_pending / finish)
+    # pour être piloté d'un bloc par execute() ou collection par collection par l'opérateur modal.
+
+    def __init__(self, context, settings, report):
+        self.context = context
+        self.settings = settings
+        self.report = report
+        self.project = settings["project"]
+        self.collections = []
+        self.warning_objs = []
+        self.pending_exports = []
+        self.exported = []
+        self.export_errors = {}
+        self.exported_count = 0
+        self.skipped_count = 0
+        self.shared_models = {}
+        self.edit_marks = {}
+        self.instance_count = 0
+        self.used_materials = {}
+        self.written_models = []
+        self.profiler = ExportProfiler()
+
+    def migrate_model_path(self, rel_model_stem):
+        # Les entrées existantes vers l'autre format (.gltf <-> .glb) sont renommées en place
+        rel_model_path = rel_model_stem + self.model_ext
+        for ext in (".gltf", ".glb"):
+            if ext != self.model_ext and self.doc.rename_model(rel_model_stem + ext, rel_model_path):
+                self.migrated_models += 1
+        return rel_model_path
+
+    def ensure_shared_model(self, src):
+        key = _shared_mesh_key(src)
+        if key in self.shared_models:
+            return self.shared_models[key]
+
+        name = _shared_mesh_name(key)
+        gltf_folder = os.path.join(self.model_root, "_Shared", name)
+        os.makedirs(gltf_folder, exist_ok=True)
+        gltf_path = os.path.join(gltf_folder, name + self.model_ext)
+        rel_model_path = self.migrate_model_path(f"Models/{self.project}/_Shared/{name}/{name}")
+
+        fingerprint = mesh_fingerprint(src, self.options_signature)
+        shared_entries = self.manifest["shared"]
+        if (self.settings["force_full_export"] or shared_entries.get(name, {}).get("fingerprint") != fingerprint
+                or not os.path.isfile(gltf_path)):
+            try:
+                with self.profiler.collection(f"_Shared/{name}"), self.stored_textures([src]):
+                    export_shared_mesh_gltf(self.context, src, gltf_path, self.gltf_options, self.profiler)
+                    self.post_export(f"_Shared/{name}", gltf_path)
+                shared_entries[name] = {"fingerprint": fingerprint, "model": rel_model_path}
+                if self.journal is not None:
+                    self.journal.complete("shared", name, shared_entries[name])
+            except Exception as e:
+                self.export_errors[f"_Shared/{name}"] = str(e)
+                shared_entries.pop(name, None)
 
-            gltf_name = f"{collection.name}.gltf"
-            gltf_folder = os.path.join(model_root, collection.name)
-            os.makedirs(gltf_folder, exist_ok=True)
-            gltf_path = os.path.join(gltf_folder, gltf_name)
-
-            bpy.ops.object.select_all(action='DESELECT')
-            for obj in visible_objects:
-                obj.select_set(True)
-                if obj.type == 'MESH':
-                    has_mat = False
-                    if hasattr(obj, 'material_slots') and len(obj.material_slots) > 0:
-                        has_mat = any(slot.material is not None for slot in obj.material_slots)
-                    if not has_mat:
-                        warning_objs.append(obj.name)
-
-            bpy.ops.export_scene.gltf(
-                filepath=gltf_path,
-                use_selection=True,
-                export_format='GLTF_SEPARATE',
-                export_apply=True
-            )
+        self.shared_models[key] = self.doc.model_index(rel_model_path)
+        return self.shared_models[key]
 
-            locs = [o.location for o in visible_objects]
-            mean_loc = [sum(coord[i] for coord in locs) / len(locs) for i in range(3)] if locs else [0.0, 0.0, 0.0]
+    def prepare(self):
+        if not self.project:
+            self.report({"ERROR"}, "Please enter a valid project name.")
+            return False
 
-            rel_model_path = f"Models/{project}/{collection.name}/{gltf_name}"
-            if rel_model_path not in data["models"]:
-                new_models.append(rel_model_path)
+        self.assets_root = self.settings["assets_root"]
+        self.model_root = os.path.join(self.assets_root, "Models", self.project)
+        os.makedirs(self.model_root, exist_ok=True)
+        self.json_path = os.path.join(self.assets_root, f"{self.project}.scene.json")
 
+        collection_registry.validate(self.context.view_layer)
+        self.root_collection = bpy.data.collections.get(EXPORT_ROOT_NAME)
+        if not self.root_collection:
+            self.report({"ERROR"}, "❌ Collection 'EXPORT_TEST' not found in the Blender scene.")
+            return False
+
+        with self.profiler.stage("scene_load"):
+            self.doc, load_error = SceneDocument.load(self.json_path)
+            self.material_store = MaterialStore(self.assets_root)
+            self.manifest_path = get_manifest_path(self.assets_root, self.project)
+            self.manifest = load_export_manifest(self.manifest_path)
+        if load_error is not None:
+            self.report({"WARNING"}, f"Failed to load existing JSON, creating new one: {load_error}")
+        self.collections = list(enumerate(self.root_collection.children))
+        if self.settings["only_collections"] is not None:
+            only = set(self.settings["only_collections"])
+            self.collections = [(i, c) for i, c in self.collections if c.name in only]
+        if self.settings["export_format"] == 'RTXPT':
+            self.report({"WARNING"}, "No native RTXPT model writer is available, exporting separate glTF files.")
+        self.model_ext = ensure_correct_extension("", 'GLB' if self.settings["export_format"] == 'GLB' else 'GLTF')
+        self.migrated_models = 0
+        self.gltf_options = get_gltf_export_options(self.settings)
+        self.texture_store = None
+        # En GLB les images sont embarquées dans le binaire : pas de store partagé
+        if self.settings["export_textures"] and self.settings["use_texture_store"] and self.model_ext != ".glb":
+            self.texture_store = TextureStore(self.model_root, self.settings["texture_format"])
+        self.gltfpack_exe = None
+        if self.settings["use_gltfpack"]:
+            exe = self.settings["gltfpack_exe"] or shutil.which("gltfpack")
+            if not exe or not os.path.isfile(exe):
+                self.report({"WARNING"}, "gltfpack executable not found, skipping gltfpack compression.")
+            elif self.settings["use_draco"]:
+                self.report({"WARNING"}, "gltfpack cannot read Draco-compressed files, skipping gltfpack compression.")
+            else:
+                self.gltfpack_exe = exe
+        self.compression_stats = {}
+        self.lod_levels = []
+        if self.settings["use_lods"]:
+            try:
+                self.lod_levels = parse_lod_levels(self.settings["lod_ratios"], self.settings["lod_screen_sizes"])
+            except ValueError as e:
+                self.report({"WARNING"}, f"Invalid LOD settings, LODs disabled: {e}")
+        self.options_signature = (
+            "format", self.model_ext,
+            "textures", self.settings["export_textures"], self.settings["texture_format"],
+            self.texture_store is not None,
+            "draco", self.settings["use_draco"], self.settings["draco_level"],
+            "gltfpack", self.gltfpack_exe is not None, self.settings["gltfpack_args"],
+            "animations", self.settings["export_animations"],
+        )
+        self.journal = None
+        # Les exports partiels (live sync) ne journalisent pas : ils laissent un journal interrompu intact
+        if self.settings["only_collections"] is None:
+            self.open_journal()
+        self.animation = None
+        if self.settings["export_animations"]:
+            frame_start, frame_end, frame_step = self.settings["frame_range"]
+            self.animation = {
+                "frame_start": frame_start,
+                "frame_end": frame_end,
+                "frame_step": frame_step,
+                "tolerance": self.settings["animation_tolerance"],
+                "bake": self.settings["bake_animations"],
+            }
+        # Les placements d'instances sont des enfants du noeud de collection ; ceux d'exports plus
+        # anciens, au premier niveau du graphe ("<Collection>/<objet>"), sont retirés
+        exported_names = {c.name for _, c in self.collections}
+        self.doc.remove_nodes(lambda name: "/" in name and name.split("/", 1)[0] in exported_names)
+        self.instance_plan = {}
+        if self.settings["use_instancing"]:
+            with self.profiler.stage("instance_plan"):
+                self.instance_plan = build_instance_plan(self.context.view_layer, self.root_collection)
+        return True
+
+    def open_journal(self):
+        journal_path = get_journal_path(self.assets_root, self.project)
+        signature = repr(self.options_signature)
+        previous = ExportJournal.load(journal_path) if os.path.isfile(journal_path) else None
+        if previous is not None:
+            previous.remove_staged()
+        if self.settings.get("resume"):
+            if previous is None:
+                self.report({"WARNING"}, "No interrupted export to resume, running a normal export.")
+            elif previous.data["signature"] != signature:
+                self.report({"WARNING"}, "Export settings changed since the interrupted export, running a normal export.")
+            else:
+                # Les entrées terminées rejoignent le manifest : empreinte identique et fichier présent = sautée
+                completed = previous.data["completed"]
+                for section in ("collections", "shared"):
+                    self.manifest[section].update(completed.get(section, {}))
+                self.journal = previous
+                self.journal.resume()
+                self.report({"INFO"}, f"Resuming export: {len(completed.get('collections', {}))} models already exported")
+                return
+        elif previous is not None:
+            self.report({"WARNING"}, "The previous export was interrupted and is discarded (use Resume Export to continue it).")
+        self.journal = ExportJournal(journal_path, signature)
+        self.journal.start()
+
+    def process_collection(self, i, collection):
+        # Retourne 'hidden', 'empty', 'instanced', 'skipped' ou 'pending' (export glTF à faire)
+        with self.profiler.collection(collection.name):
+            return self._process_collection(i, collection)
+
+    def _process_collection(self, i, collection):
+        entry = collection_registry.entry(self.context.view_layer, collection.name)
+        self.edit_marks[collection.name] = entry["edits"]
+        if entry["hidden"]:
+            return 'hidden'
+
+        visible_objects = entry["objects"]
+        if not visible_objects:
+            return 'empty'
+        self.warning_objs.extend(entry["missing_materials"])
+
+        # Un seul passage sur les slots : matériaux à écrire et propriétés du noeud
+        with self.profiler.stage("material_scan"):
             material_props = {}
             for obj in visible_objects:
-                if hasattr(obj, 'material_slots'):
-                    for slot in obj.material_slots:
-                        if slot.material is not None:
-                            mat = slot.material
-                            if "ignore_neeshadowray" in mat:
-                                material_props["ignore_neeshadowray"] = bool(mat["ignore_neeshadowray"])
-                            if "exclude_from_nee" in mat and bool(mat["exclude_from_nee"]):
-                                material_props["ExcludeFromNEE"] = True
-
-            if collection.name == selected_node_name:
-                translation = list(props.node_translation)
-                scale = props.node_scale
-            else:
-                translation = [round(mean_loc[0], 3), round(mean_loc[1], 3), round(mean_loc[2], 3)]
-                scale = 1.0
+                for slot in obj.material_slots:
+                    mat = slot.material
+                    if mat is not None:
+                        self.used_materials[mat.as_pointer()] = mat
+                        material_props.update(self.material_store.extract(mat)["node_properties"])
+
+        placements = self.instance_plan.get(collection.name, [])
+        instanced_owners = {owner for _, _, _, owner in placements}
+        for _, src, _, _ in placements:
+            self.ensure_shared_model(src)
+        self.instance_count += len(placements)
+        export_objects = [o for o in visible_objects if o.name not in instanced_owners]
+        if not export_objects:
+            with self.profiler.stage("json_merge"):
+                return self.merge_instanced_node(collection, placements, material_props)
+
+        if self.settings["use_tiling"]:
+            with self.profiler.stage("tiling"):
+                tiles = plan_tiles(export_objects, self.settings["tile_mode"], self.settings["tile_size"],
+                                   self.settings["tile_max_objects"])
+            if tiles:
+                return self.process_tiles(collection, tiles, placements, material_props)
+
+        gltf_name = collection.name + self.model_ext
+        gltf_folder = os.path.join(self.model_root, collection.name)
+        os.makedirs(gltf_folder, exist_ok=True)
+        gltf_path = os.path.join(gltf_folder, gltf_name)
+        rel_model_path = self.migrate_model_path(f"Models/{self.project}/{collection.name}/{collection.name}")
+
+        status = 'skipped'
+        bounds = WorldBounds()
+        with self.profiler.stage("fingerprint"):
+            fingerprint = collection_fingerprint(self.context, collection, export_objects,
+                                                 options=("instancing", bool(placements)) + self.options_signature
+                                                         + animation_signature(export_objects, self.animation),
+                                                 bounds=bounds)
+        if bounds.is_empty():
+            for obj in export_objects:
+                bounds.add_point(obj.matrix_world.translation)
+        # Les LODs sont mis en cache séparément : changer les ratios ne réexporte pas le modèle de base
+        lods = []
+        for level, (ratio, screen_size) in enumerate(self.lod_levels, start=1):
+            lod_name = f"{collection.name}_LOD{level}"
+            lods.append({
+                "ratio": ratio,
+                "screen_size": screen_size,
+                "path": os.path.join(gltf_folder, lod_name + self.model_ext),
+                "rel": self.migrate_model_path(f"Models/{self.project}/{collection.name}/{lod_name}"),
+                "label": lod_name,
+            })
 
-            node_info = {
+        previous = self.manifest["collections"].get(collection.name, {})
+        base_valid = (not self.settings["force_full_export"] and previous.get("fingerprint") == fingerprint
+                      and os.path.isfile(gltf_path))
+        cached_lods = previous.get("lods", {}) if base_valid else {}
+        lod_todo = [lod for lod in lods
+                    if cached_lods.get(repr(lod["ratio"])) != lod["rel"] or not os.path.isfile(lod["path"])]
+        if base_valid and not lod_todo:
+            self.skipped_count += 1
+        else:
+            status = 'pending'
+            outputs = [] if base_valid else [(collection.name, gltf_path)]
+            outputs += [(lod["label"], lod["path"]) for lod in lod_todo]
+            self.pending_exports.append({
                 "name": collection.name,
-                "model": i,
-                "translation": translation,
-                "scaling": scale
+                "path": gltf_path,
+                "weight": len(export_objects) * (len(lod_todo) + (0 if base_valid else 1)),
+                "objects": export_objects,
+                "collection": collection,
+                "export_base": not base_valid,
+                "lods": [[lod["ratio"], lod["path"]] for lod in lod_todo],
+                "outputs": outputs,
+                "manifest": {"fingerprint": fingerprint, "model": rel_model_path,
+                             "lods": {repr(lod["ratio"]): lod["rel"] for lod in lods}},
+            })
+
+        with self.profiler.stage("json_merge"):
+            return self.merge_collection_node(collection, rel_model_path, bounds, lods, material_props, status,
+                                              placements)
+
+    def process_tiles(self, collection, tiles, placements, material_props):
+        # Chaque tuile a son modèle, son empreinte et son job d'export : seules les tuiles modifiées
+        # sont réexportées, une à la fois, donc la mémoire dépend de la tuile et non de la collection.
+        # Pas de LOD pour les tuiles.
+        gltf_folder = os.path.join(self.model_root, collection.name)
+        os.makedirs(gltf_folder, exist_ok=True)
+        prefixes = tuple(f"{collection.name}_{p}" for p in TILE_PREFIXES)
+        # Passage au découpage : le modèle de la collection entière n'est plus référencé
+        self.remove_collection_model(collection.name)
+        tiling_signature = ("tiling", self.settings["tile_mode"], self.settings["tile_size"], self.settings["tile_max_objects"])
+        manifest_entries = self.manifest["collections"]
+        bounds = WorldBounds()
+        children = []
+        pending = 0
+        for suffix, objects in tiles:
+            tile_name = f"{collection.name}_{suffix}"
+            tile_path = os.path.join(gltf_folder, tile_name + self.model_ext)
+            rel_model_path = self.migrate_model_path(f"Models/{self.project}/{collection.name}/{tile_name}")
+            tile_bounds = WorldBounds()
+            with self.profiler.stage("fingerprint"):
+                fingerprint = collection_fingerprint(
+                    self.context, collection, objects,
+                    options=("instancing", bool(placements), "tile", suffix) + tiling_signature + self.options_signature
+                            + animation_signature(objects, self.animation),
+                    bounds=tile_bounds)
+            if tile_bounds.is_empty():
+                for obj in objects:
+                    tile_bounds.add_point(obj.matrix_world.translation)
+            bounds.merge(tile_bounds)
+
+            previous = manifest_entries.get(tile_name, {})
+            if (self.settings["force_full_export"] or previous.get("fingerprint") != fingerprint
+                    or not os.path.isfile(tile_path)):
+                pending += 1
+                self.pending_exports.append({
+                    "name": tile_name,
+                    "path": tile_path,
+                    "weight": len(objects),
+                    "objects": objects,
+                    "collection": collection,
+                    "export_base": True,
+                    "lods": [],
+                    "outputs": [(tile_name, tile_path)],
+                    "manifest": {"fingerprint": fingerprint, "model": rel_model_path},
+                })
+
+            # Géométrie de la tuile exportée en coordonnées monde : la tuile reste à l'origine du parent
+            child = {
+                "name": tile_name,
+                "model": self.doc.model_index(rel_model_path),
+                "translation": [0.0, 0.0, 0.0],
+                "scaling": 1.0
             }
-            if material_props:
-                node_info["material_properties"] = material_props
+            child.update(tile_bounds.to_node_fields(self.settings["bounding_spheres"]))
+            children.append(child)
 
-            existing_node = next((n for n in data["graph"] if n.get("name") == collection.name), None)
-            if existing_node:
-                existing_node.update(node_info)
-            else:
-                new_graph.append(node_info)
-
-        data["models"].extend(new_models)
-        data["graph"].extend(new_graph)
-
-        if not any(n.get("name") == "Lights" for n in data["graph"]):
-            data["graph"].append({
-                "name": "Lights",
-                "children": [{
-                    "name": "Sky",
-                    "type": "EnvironmentLight",
-                    "radianceScale": [1, 1, 1],
-                    "textureIndex": [0],
-                    "rotation": [0],
-                    "path": "==PROCEDURAL_SKY=="
-                }]
-            })
+        self.remove_stale_tiles(collection.name, {child["name"] for child in children})
+        if not pending:
+            self.skipped_count += 1
 
-        if not any(n.get("name") == "Cameras" for n in data["graph"]):
-            data["graph"].append({
-                "name": "Cameras",
-                "children": [{
-                    "name": "Outside",
-                    "type": "PerspectiveCamera",
-                    "translation": list(cam_props.translation),
-                    "rotation": list(cam_props.rotation),
-                    "verticalFov": cam_props.vertical_fov,
-                    "zNear": cam_props.z_near,
-                    "exposureValue": cam_props.exposure_value,
-                    "enableAutoExposure": cam_props.enable_auto_exposure,
-                    "exposureCompensation": cam_props.exposure_compensation,
-                    "exposureValueMin": cam_props.exposure_value_min,
-                    "exposureValueMax": cam_props.exposure_value_max
-                }]
+        with self.profiler.stage("json_merge"):
+            translation, scale = self.node_transform(collection)
+            node_info = {"name": collection.name, "translation": translation, "scaling": scale}
+            node_info.update(bounds.to_node_fields(self.settings["bounding_spheres"]))
+            if material_props:
+                node_info["material_properties"] = material_props
+            node = self.doc.merge_node(node_info)
+            node.pop("model", None)
+            node.pop("lods", None)
+            children += self.placement_children(placements)
+            self.doc.merge_children(node, children, prefixes + (f"{collection.name}/",))
+        return 'pending' if pending else 'skipped'
+
+    def node_transform(self, collection):
+        # -> (translation, échelle) du noeud de collection. Les modèles sont exportés en coordonnées
+        # monde : le noeud reste à l'origine, sauf réglage manuel qui déplace alors modèle, tuiles et
+        # instances ensemble.
+        if collection.name == self.settings["selected_node"]:
+            return list(self.settings["node_translation"]), self.settings["node_scale"]
+        return [0.0, 0.0, 0.0], 1.0
+
+    def placement_children(self, placements):
+        # Noeuds enfants des instances, dans le même repère (monde) que la géométrie de la collection
+        children = []
+        for node_name, src, matrix, _ in placements:
+            child_translation, rotation, scaling = gltf_node_transform(matrix)
+            children.append({
+                "name": node_name,
+                "model": self.shared_models[_shared_mesh_key(src)],
+                "translation": child_translation,
+                "rotation": rotation,
+                "scaling": scaling
             })
+        return children
+
+    def merge_instanced_node(self, collection, placements, material_props):
+        # Collection entièrement instanciée : plus de modèle propre, seulement les placements
+        translation, scale = self.node_transform(collection)
+        bounds = WorldBounds()
+        bounds.add_boxes(*placement_world_boxes(placements))
+        node_info = {"name": collection.name, "translation": translation, "scaling": scale}
+        node_info.update(bounds.to_node_fields(self.settings["bounding_spheres"]))
+        if material_props:
+            node_info["material_properties"] = material_props
+        node = self.doc.merge_node(node_info)
+        node.pop("model", None)
+        node.pop("lods", None)
+        prefixes = tuple(f"{collection.name}_{p}" for p in TILE_PREFIXES)
+        self.doc.merge_children(node, self.placement_children(placements),
+                                prefixes + (f"{collection.name}/",))
+        self.remove_stale_tiles(collection.name)
+        self.remove_collection_model(collection.name)
+        return 'instanced'
+
+    def remove_collection_model(self, name):
+        # Modèle (et LODs) d'un export précédent de la collection entière, devenu inutile
+        stale = self.manifest["collections"].pop(name, None)
+        if stale is None:
+            return
+        for rel in [stale.get("model", "")] + list(stale.get("lods", {}).values()):
+            if rel:
+                remove_model_files(os.path.join(self.assets_root, *rel.split("/")))
+
+    def remove_stale_tiles(self, parent, keep=()):
+        # Tuiles d'un découpage précédent de parent (liste du manifest) : fichiers et entrées retirés
+        manifest_entries = self.manifest["collections"]
+        tiles = self.manifest["tiles"]
+        for name in tiles.pop(parent, []):
+            if name in keep:
+                continue
+            stale = manifest_entries.pop(name, None)
+            if stale is not None:
+                remove_model_files(os.path.join(self.assets_root, *stale.get("model", "").split("/")))
+        if keep:
+            tiles[parent] = sorted(keep)
+
+    def merge_collection_node(self, collection, rel_model_path, bounds, lods, material_props, status, placements=()):
+        model_index = self.doc.model_index(rel_model_path)
+        translation, scale = self.node_transform(collection)
+
+        node_info = {
+            "name": collection.name,
+            "model": model_index,
+            "translation": translation,
+            "scaling": scale
+        }
+        node_info.update(bounds.to_node_fields(self.settings["bounding_spheres"]))
+        if lods:
+            node_info["lods"] = [{
+                "model": self.doc.model_index(lod["rel"]),
+                "ratio": lod["ratio"],
+                "screenSize": lod["screen_size"]
+            } for lod in lods]
+        if material_props:
+            node_info["material_properties"] = material_props
+
+        node = self.doc.merge_node(node_info)
+        if not lods:
+            node.pop("lods", None)
+        prefixes = tuple(f"{collection.name}_{p}" for p in TILE_PREFIXES)
+        self.doc.merge_children(node, self.placement_children(placements),
+                                prefixes + (f"{collection.name}/",))
+        self.remove_stale_tiles(collection.name)
+        return status
+
+    def post_export(self, name, gltf_path):
+        remove_stale_model(gltf_path)
+        if self.texture_store is not None:
+            stored_bytes = self.texture_store.stored_bytes
+            with self.profiler.stage("texture_store"):
+                self.texture_store.ingest_gltf(gltf_path)
+            self.profiler.add_bytes("texture_store", self.texture_store.stored_bytes - stored_bytes)
+        if self.settings["use_draco"] or self.gltfpack_exe:
+            with self.profiler.stage("compression"):
+                before = gltf_uncompressed_size(gltf_path) if self.settings["use_draco"] else gltf_asset_size(gltf_path)
+                if self.gltfpack_exe:
+                    run_gltfpack(self.gltfpack_exe, gltf_path, self.settings["gltfpack_args"])
+                self.compression_stats[name] = (before, gltf_asset_size(gltf_path))
+        self.profiler.add_bytes("gltf_export", gltf_asset_size(gltf_path))
+        self.written_models.append(os.path.relpath(gltf_path, self.assets_root).replace(os.sep, "/"))
+
+    @contextmanager
+    def stored_textures(self, objects):
+        # Images déjà au format cible dans le store : l'exporteur n'a plus à les réencoder
+        if self.texture_store is None:
+            yield
+            return
+        stored_bytes = self.texture_store.stored_bytes
+        with self.profiler.stage("texture_store"):
+            targets = self.texture_store.prepare_images(objects)
+        self.profiler.add_bytes("texture_store", self.texture_store.stored_bytes - stored_bytes)
+        with self.texture_store.redirected(targets):
+            yield
+
+    def export_one(self, job):
+        with self.profiler.collection(job["name"]):
+            try:
+                with self.stored_textures(job["objects"]):
+                    export_collection_outputs(job["objects"], job, self.gltf_options, self.profiler,
+                                              job["collection"], self.animation)
+                for label, path in job["outputs"]:
+                    self.post_export(label, path)
+                self.exported.append(job["name"])
+                self.journal_job(job)
+            except Exception as e:
+                self.export_errors[job["name"]] = str(e)
+        job["done"] = True
+
+    def journal_job(self, job):
+        if self.journal is not None:
+            self.journal.complete("collections", job["name"], job["manifest"])
+
+    def export_pending(self):
+        todo = [job for job in self.pending_exports if not job.get("done")]
+        parallel = self.settings["parallel_export"] and len(todo) > 1
+        blender_exe = self.settings["blender_exe"]
+        if parallel and blender_exe and os.path.isfile(blender_exe):
+            # Le snapshot des workers est enregistré avec les noeuds déjà redirigés vers le store
+            with self.stored_textures([obj for job in todo for obj in job["objects"]]), \
+                    self.profiler.stage("worker_pool"):
+                exported, export_errors, worker_warnings, timings = run_parallel_export(
+                    todo, self.settings["worker_count"], blender_exe, self.gltf_options, self.animation)
+            self.export_errors.update(export_errors)
+            self.warning_objs.extend(worker_warnings)
+            for job in todo:
+                job["done"] = True
+                # Temps passé dans le worker : se recouvre avec worker_pool, non additif au total
+                if job["name"] in timings:
+                    self.profiler.record("worker_export", timings[job["name"]], job["name"])
+                if job["name"] in exported and job["name"] not in self.export_errors:
+                    with self.profiler.collection(job["name"]):
+                        try:
+                            for label, path in job["outputs"]:
+                                self.post_export(label, path)
+                            self.exported.append(job["name"])
+                            self.journal_job(job)
+                        except Exception as e:
+                            self.export_errors[job["name"]] = str(e)
+        else:
+            if parallel:
+                self.report({"WARNING"}, "Blender executable not found for worker processes, exporting serially.")
+            for job in todo:
+                self.export_one(job)
+
+    def finish(self):
+        manifest_entries = self.manifest["collections"]
+        for job in self.pending_exports:
+            if job["name"] in self.exported and job["name"] not in self.export_errors:
+                manifest_entries[job["name"]] = job["manifest"]
+                self.exported_count += 1
+            else:
+                manifest_entries.pop(job["name"], None)
+        for name, err in self.export_errors.items():
+            self.report({"ERROR"}, f"Export failed for collection '{name}': {err}")
+
+        self.doc.add_node_if_missing({
+            "name": "Lights",
+            "children": [{
+                "name": "Sky",
+                "type": "EnvironmentLight",
+                "radianceScale": [1, 1, 1],
+                "textureIndex": [0],
+                "rotation": [0],
+                "path": "==PROCEDURAL_SKY=="
+            }]
+        })
+
+        self.doc.add_node_if_missing({
+            "name": "Cameras",
+            "children": [dict({
+                "name": "Outside",
+                "type": "PerspectiveCamera"
+            }, **self.settings["camera"])]
+        })
 
         try:
-            with open(json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            with self.profiler.stage("material_write"):
+                material_items = self.material_store.stage(self.used_materials.values())
         except Exception as e:
-            self.report({"ERROR"}, f"Error writing JSON: {e}")
-            return {"CANCELLED"}
-
-        materials_folder = os.path.join(assets_root, "Materials")
-        os.makedirs(materials_folder, exist_ok=True)
-        unique_materials = set()
-        for collection in root_collection.children:
-            for obj in collection.objects:
-                if hasattr(obj, 'material_slots'):
-                    for slot in obj.material_slots:
-                        if slot.material is not None:
-                            unique_materials.add(slot.material)
-
-        for mat in unique_materials:
-            mat_json = {
-                "AlphaCutoff": getattr(mat, "alpha_threshold", 0.5),
-                "BaseOrDiffuseColor": safe_color(getattr(mat, "diffuse_color", (1.0, 1.0, 1.0))),
-                "DiffuseTransmissionFactor": getattr(mat, "diffuse_transmission_factor", 0.0),
-                "EmissiveColor": safe_color(getattr(mat, "emissive_color", (0.0, 0.0, 0.0))),
-                "EmissiveIntensity": getattr(mat, "emissive_intensity", 1.0),
-                "EnableAlphaTesting": False,
-                "EnableAsAnalyticLightProxy": False,
-                "EnableBaseTexture": True,
-                "EnableEmissiveTexture": True,
-                "EnableNormalTexture": True,
-                "EnableOcclusionRoughnessMetallicTexture": True,
-                "EnableTransmission": True,
-                "EnableTransmissionTexture": True,
-                "ExcludeFromNEE": ("exclude_from_nee" in mat and bool(mat["exclude_from_nee"])),
-                "IoR": getattr(mat, "ior", 2.0),
-                "Metalness": getattr(mat, "metallic", 0.0),
-                "MetalnessInRedChannel": False,
-                "NestedPriority": getattr(mat, "nested_priority", 14),
-                "NormalTextureScale": getattr(mat, "normal_scale", 0.0),
-                "Opacity": getattr(mat, "opacity", 1.0),
-                "PSDDominantDeltaLobe": 0,
-                "PSDExclude": False,
-                "Roughness": getattr(mat, "roughness", 0.0),
-                "ShadowNoLFadeout": 0.0,
-                "SpecularColor": safe_color(getattr(mat, "specular_color", (0.0, 0.0, 0.0))),
-                "ThinSurface": getattr(mat, "thin_surface", False),
-                "TransmissionFactor": getattr(mat, "transmission_factor", 1.0),
-                "UseSpecularGlossModel": False,
-                "VolumeAttenuationColor": [1.0, 1.0, 1.0],
-                "VolumeAttenuationDistance": 3.4028234663852886e+38,
-                "version": 1,
-            }
-            mat_path = os.path.join(materials_folder, f"{mat.name}.material.json")
-            with open(mat_path, "w", encoding="utf-8") as f:
-                json.dump(mat_json, f, indent=2)
+            self.report({"ERROR"}, f"Failed to prepare material files: {e}")
+            return False
 
-        exe_path = addon_prefs.rtxpt_exe
-        if exe_path and os.path.isfile(bpy.path.abspath(exe_path)):
-            import subprocess
+        # Scène, manifest et matériaux validés ensemble : tous écrits en temporaire avant le premier
+        # remplacement, les temporaires étant journalisés pour le nettoyage après un crash
+        commit_items = [(self.json_path, self.doc.data),
+                        (self.manifest_path, self.manifest, {"sort_keys": True})] + material_items
+        try:
+            with self.profiler.stage("commit"):
+                write_json_batch(commit_items, self.journal.begin_commit if self.journal is not None else None,
+                                 indent=2)
+            self.profiler.add_bytes("commit", sum(os.path.getsize(item[0]) for item in commit_items))
+        except Exception as e:
+            self.report({"ERROR"}, f"Error writing scene, manifest and material files: {e}")
+            return False
+        if self.journal is not None:
+            self.journal.discard()
+        # Collections propres seulement une fois scène et manifest écrits : un échec reste à refaire
+        failed = {job["collection"].name for job in self.pending_exports if job["name"] in self.export_errors}
+        collection_registry.mark_clean({name: edits for name, edits in self.edit_marks.items() if name not in failed})
+
+        if self.texture_store is not None:
+            try:
+                self.texture_store.save_index()
+            except Exception as e:
+                self.report({"WARNING"}, f"Failed to write texture store index: {e}")
+
+        exe_path = self.settings["rtxpt_exe"]
+        session_mode = self.settings["rtxpt_session_mode"]
+        changed_materials = [f"Materials/{name}.material.json" for name in self.material_store.written_names]
+        if self.settings["launch_rtxpt"] and exe_path and os.path.isfile(exe_path):
+            with self.profiler.stage("rtxpt_launch"):
+                try:
+                    action = rtxpt_session.sync(exe_path, self.json_path, session_mode,
+                                                self.written_models, changed_materials)
+                    if action == "reloaded":
+                        self.report({"INFO"}, f"RTXPT (pid {rtxpt_session.proc.pid}) asked to reload "
+                                              f"{len(self.written_models)} models, {len(changed_materials)} materials")
+                    else:
+                        self.report({"INFO"}, f"RTXPT {action} from: {exe_path}")
+                except Exception as e:
+                    self.report({"WARNING"}, f"Failed to launch RTXPT.exe: {e}")
+        elif session_mode == 'RELOAD' and rtxpt_session.owns(self.json_path):
+            # Export sans lancement (live sync) : l'instance déjà ouverte sur cette scène est rechargée
             try:
-                subprocess.Popen([bpy.path.abspath(exe_path), "--scene", json_path])
-                self.report({"INFO"}, f"RTXPT launched from: {exe_path}")
+                rtxpt_session.request_reload(self.written_models, changed_materials)
             except Exception as e:
-                self.report({"WARNING"}, f"Failed to launch RTXPT.exe: {e}")
+                self.report({"WARNING"}, f"Failed to request RTXPT reload: {e}")
 
-        if warning_objs:
-            unique_objs = ', '.join(set(warning_objs))
+        if self.warning_objs:
+            unique_objs = ', '.join(set(self.warning_objs))
             self.report({'WARNING'}, f"Warning: The following objects have no material and may cause RTXPT render crash: {unique_objs}")
 
-        self.report({"INFO"}, f"Project export completed: {json_path}")
+        self.report({"INFO"}, f"Collections: {self.exported_count} rebuilt, {self.skipped_count} skipped (unchanged)")
+        self.report({"INFO"}, f"Materials: {self.material_store.written} written, {self.material_store.unchanged} unchanged")
+        if self.migrated_models:
+            self.report({"INFO"}, f"Migrated {self.migrated_models} scene model entries to {self.model_ext}")
+        if self.compression_stats:
+            total_before = sum(b for b, _ in self.compression_stats.values())
+            total_after = sum(a for _, a in self.compression_stats.values())
+            for name, (before, after) in sorted(self.compression_stats.items()):
+                self.report({"INFO"}, f"Compression {name}: {format_size(before)} -> {format_size(after)}")
+            self.report({"INFO"}, f"Compression total: {format_size(total_before)} -> {format_size(total_after)} "
+                                  f"({100.0 * (1.0 - total_after / max(1, total_before)):.0f}% smaller)")
+        if self.texture_store is not None and (self.texture_store.stored or self.texture_store.reused):
+            self.report({"INFO"}, f"Texture store: {self.texture_store.stored} new, {self.texture_store.reused} reused")
+        if self.instance_count:
+            self.report({"INFO"}, f"Instancing: {self.instance_count} placements of {len(self.shared_models)} shared meshes")
+        self.write_profile()
+        self.report({"INFO"}, f"Project export completed: {self.json_path}")
+        return True
+
+    def write_profile(self):
+        profile_path = get_profile_path(self.assets_root, self.project)
+        try:
+            write_json_atomic(profile_path, dict(self.profiler.report(), project=self.project), indent=2)
+        except Exception as e:
+            self.report({"WARNING"}, f"Failed to write export profile: {e}")
+            return
+        summary = self.profiler.summary_lines()
+        wm = getattr(self.context, "window_manager", None)
+        if wm is not None and hasattr(wm, "rtxpt_export_progress"):
+            wm.rtxpt_export_progress.profile_summary = "\n".join(summary)
+        self.report({"INFO"}, f"Export profile: {summary[0]} ({profile_path})")
+
+    def run(self):
+        with collection_registry.ignoring_updates(self.context.view_layer):
+            if not self.prepare():
+                return False
+            for i, collection in self.collections:
+                self.process_collection(i, collection)
+            self.export_pending()
+            return self.finish()
+
+    def steps(self):
+        # Même export découpé en étapes (préparation, une collection et ses modèles, écriture finale)
+        # pour le live sync ; chaque étape absorbe ses propres mises à jour. -> résultat de finish()
+        view_layer = self.context.view_layer
+        with collection_registry.ignoring_updates(view_layer):
+            ok = self.prepare()
+        if not ok:
+            return False
+        for i, collection in self.collections:
+            yield
+            self.context = bpy.context
+            with collection_registry.ignoring_updates(view_layer):
+                if self.process_collection(i, collection) == 'pending':
+                    for job in [job for job in self.pending_exports if not job.get("done")]:
+                        self.export_one(job)
+        yield
+        self.context = bpy.context
+        with collection_registry.ignoring_updates(view_layer):
+            return self.finish()
+
+
+class RTXPT_OT_ProjectExport(bpy.types.Operator):
+    bl_idname = "rtxpt.project_export"
+    bl_label = "Export RTXPT Project"
+    bl_options = {"REGISTER"}
+
+    resume: BoolProperty(
+        name="Resume",
+        description="Continue an interrupted export, skipping the models it already finished",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return not context.window_manager.rtxpt_export_progress.running
+
+    def execute(self, context):
+        settings = get_export_settings(context)
+        settings["resume"] = self.resume
+        job = ProjectExportJob(context, settings, self.report)
+        return {"FINISHED"} if job.run() else {"CANCELLED"}
+
+
+class RTXPT_OT_SessionStop(bpy.types.Operator):
+    bl_idname = "rtxpt.session_stop"
+    bl_label = "Close RTXPT"
+    bl_description = "Close the RTXPT instance started by the exporter"
+
+    def execute(self, context):
+        if not rtxpt_session.alive():
+            self.report({"WARNING"}, "RTXPT is not running.")
+            return {"CANCELLED"}
+        rtxpt_session.stop()
+        self.report({"INFO"}, "RTXPT closed")
         return {"FINISHED"}
 
+class RTXPT_OT_ProjectExportModal(bpy.types.Operator):
+    bl_idname = "rtxpt.project_export_modal"
+    bl_label = "Export RTXPT Project (Background)"
+    bl_description = "Export one collection per tick with progress in the RTXPT panel, Esc to cancel"
+    bl_options = {"REGISTER"}
+
+    _timer = None
+
+    resume: BoolProperty(
+        name="Resume",
+        description="Continue an interrupted export, skipping the models it already finished",
+        default=False,
+        options={'SKIP_SAVE'}
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return not context.window_manager.rtxpt_export_progress.running
+
+    def execute(self, context):
+        # Appel depuis un script (EXEC_DEFAULT) : pas d'événements, export synchrone
+        settings = get_export_settings(context)
+        settings["resume"] = self.resume
+        job = ProjectExportJob(context, settings, self.report)
+        return {"FINISHED"} if job.run() else {"CANCELLED"}
+
+    def invoke(self, context, event):
+        settings = get_export_settings(context)
+        settings["resume"] = self.resume
+        self.job = ProjectExportJob(context, settings, self.report)
+        with collection_registry.ignoring_updates(context.view_layer):
+            if not self.job.prepare():
+                return {"CANCELLED"}
+        self.index = 0
+
+        progress = context.window_manager.rtxpt_export_progress
+        progress.running = True
+        progress.progress = 0.0
+        progress.status = "Starting export..."
+        progress.collections.clear()
+        for _, collection in self.job.collections:
+            item = progress.collections.add()
+            item.name = collection.name
+            item.status = "Queued"
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.stop(context)
+            self.report({"WARNING"}, "Export cancelled, scene and material files left untouched (Resume Export continues it).")
+            return {"CANCELLED"}
+
+        if event.type != 'TIMER':
+            return {"PASS_THROUGH"}
+
+        # Une exception laisserait le timer actif et la progression bloquée sur "running"
+        try:
+            with collection_registry.ignoring_updates(context.view_layer):
+                return self.step(context)
+        except Exception as e:
+            self.stop(context)
+            self.report({"ERROR"}, f"Export failed: {e} (scene and material files left untouched, Resume Export continues it).")
+            return {"CANCELLED"}
+
+    def step(self, context):
+        # Le contexte d'invoke() n'est plus valide entre deux événements
+        self.job.context = context
+        progress = context.window_manager.rtxpt_export_progress
+        total = len(self.job.collections)
+        if self.index < total:
+            i, collection = self.job.collections[self.index]
+            item = progress.collections[self.index]
+            progress.status = f"Exporting {collection.name} ({self.index + 1}/{total})"
+            status = self.job.process_collection(i, collection)
+            if status == 'pending':
+                # Une collection découpée en tuiles produit plusieurs jobs
+                jobs = [job for job in self.job.pending_exports if not job.get("done")]
+                for job in jobs:
+                    self.job.export_one(job)
+                item.status = "Failed" if any(job["name"] in self.job.export_errors for job in jobs) else "Exported"
+            else:
+                item.status = {"hidden": "Hidden", "empty": "Empty", "instanced": "Instanced", "skipped": "Unchanged"}[status]
+            self.index += 1
+            progress.progress = 100.0 * self.index / max(1, total)
+            self.redraw(context)
+            return {"RUNNING_MODAL"}
+
+        progress.status = "Writing scene and material files..."
+        ok = self.job.finish()
+        self.stop(context)
+        return {"FINISHED"} if ok else {"CANCELLED"}
+
+    def stop(self, context):
+        if self._timer is not None:
+            context.window_manager.event_timer_remove(self._timer)
+            self._timer = None
+        progress = context.window_manager.rtxpt_export_progress
+        progress.running = False
+        progress.status = ""
+        self.redraw(context)
+
+    def redraw(self, context):
+        for window in context.window_manager.windows:
+            for area in window.screen.areas:
+                if area.type == 'VIEW_3D':
+                    area.tag_redraw()
+
 
 class RTXPT_MaterialEdit_Props(bpy.types.PropertyGroup):
+    assets_root: StringProperty(
+        name="Assets Folder",
+        description="RTXPT Assets folder holding Materials/ (empty: the project's Assets folder)",
+        subtype='DIR_PATH',
+        default=""
+    )
     material_name: StringProperty(name="Material Name")
     exclude_from_nee: BoolProperty(name="Exclude From NEE", default=False)
+    filter_pattern: StringProperty(
+        name="Name Filter",
+        description="Wildcard pattern on material names, e.g. Glass* (empty: every material)",
+        default=""
+    )
+    filter_collection: EnumProperty(
+        name="Collection",
+        description="Only materials used by the visible objects of this collection",
+        items=get_material_filter_collections
+    )
+    bulk_field: EnumProperty(
+        name="Field",
+        items=MATERIAL_BULK_FIELDS,
+        default='ExcludeFromNEE'
+    )
+    filter_value: EnumProperty(
+        name="Current Value",
+        items=[
+            ('ANY', "Any", "Whatever the current value"),
+            ('ON', "On", "Only materials where the field is currently on"),
+            ('OFF', "Off", "Only materials where the field is currently off"),
+        ],
+        default='ANY'
+    )
+    bulk_value: BoolProperty(name="New Value", default=True)
 
 class RTXPT_OT_MaterialEditLoad(bpy.types.Operator):
     bl_idname = "rtxpt.material_edit_load"
@@ -480,17 +3555,12 @@ class RTXPT_OT_MaterialEditLoad(bpy.types.Operator):
 
     def execute(self, context):
         props = context.scene.rtxpt_material_edit_props
-        assets_root = bpy.path.abspath(props.assets_root) if hasattr(props, "assets_root") else bpy.path.abspath("//rtxpt_v.1.7.0_binaries/Assets")
-        materials_folder = os.path.join(assets_root, "Materials")
-        mat_filename = f"{props.material_name}.material.json"
-        mat_path = os.path.join(materials_folder, mat_filename)
-        if not os.path.exists(mat_path):
-            self.report({"ERROR"}, f"Material file not found: {mat_path}")
+        index = get_material_index(get_material_assets_root(context))
+        mat_json = index.load(props.material_name)
+        if mat_json is None:
+            self.report({"ERROR"}, f"Material file not found: {os.path.join(index.folder, props.material_name + MaterialIndex.SUFFIX)}")
             return {"CANCELLED"}
 
-        with open(mat_path, "r", encoding="utf-8") as f:
-            mat_json = json.load(f)
-
         props.exclude_from_nee = mat_json.get("ExcludeFromNEE", False)
         self.report({"INFO"}, f"Material data loaded for {props.material_name}")
         return {"FINISHED"}
@@ -501,59 +3571,326 @@ class RTXPT_OT_MaterialEditSave(bpy.types.Operator):
 
     def execute(self, context):
         props = context.scene.rtxpt_material_edit_props
-        assets_root = bpy.path.abspath(props.assets_root) if hasattr(props, "assets_root") else bpy.path.abspath("//rtxpt_v.1.7.0_binaries/Assets")
-        materials_folder = os.path.join(assets_root, "Materials")
-        mat_filename = f"{props.material_name}.material.json"
-        mat_path = os.path.join(materials_folder, mat_filename)
-
-        if not os.path.exists(mat_path):
+        index = get_material_index(get_material_assets_root(context))
+        mat_path = os.path.join(index.folder, props.material_name + MaterialIndex.SUFFIX)
+        try:
+            index.write({props.material_name: {"ExcludeFromNEE": props.exclude_from_nee}})
+        except KeyError:
             self.report({"ERROR"}, f"Material file not found: {mat_path}")
             return {"CANCELLED"}
 
-        with open(mat_path, "r", encoding="utf-8") as f:
-            mat_json = json.load(f)
+        # Même règle que l'édition en masse : la source Blender suit le fichier
+        mat = bpy.data.materials.get(props.material_name)
+        if mat is not None:
+            mat["exclude_from_nee"] = props.exclude_from_nee
+        self.report({"INFO"}, f"Material file saved: {mat_path}")
+        return {"FINISHED"}
 
-        mat_json["ExcludeFromNEE"] = props.exclude_from_nee
+class RTXPT_OT_MaterialBulkApply(bpy.types.Operator):
+    bl_idname = "rtxpt.material_bulk_apply"
+    bl_label = "Apply to Matching Materials"
+    bl_description = "Set the chosen field on every material file matching the filters, in one atomic write pass"
 
-        with open(mat_path, "w", encoding="utf-8") as f:
-            json.dump(mat_json, f, indent=2)
+    def execute(self, context):
+        props = context.scene.rtxpt_material_edit_props
+        index = get_material_index(get_material_assets_root(context))
+        index.refresh(deep=True)
+        targets = bulk_material_targets(context)
+        if not targets:
+            self.report({"WARNING"}, "No material file matches the filters.")
+            return {"CANCELLED"}
+        try:
+            count = index.write({name: {props.bulk_field: props.bulk_value} for name in targets})
+        except Exception as e:
+            self.report({"ERROR"}, f"Bulk material edit failed, no file was modified: {e}")
+            return {"CANCELLED"}
 
-        self.report({"INFO"}, f"Material file saved: {mat_path}")
+        # Garde la source Blender cohérente : le prochain export réécrirait sinon la valeur
+        if props.bulk_field == 'ExcludeFromNEE':
+            for name in targets:
+                mat = bpy.data.materials.get(name)
+                if mat is not None:
+                    mat["exclude_from_nee"] = props.bulk_value
+        self.report({"INFO"}, f"{props.bulk_field} set to {props.bulk_value} on {count} material files")
         return {"FINISHED"}
 
+# 5bis. Live sync : réexport différé des collections modifiées
+
+LIVE_SYNC_INTERVAL = 0.25
+LIVE_SYNC_STEP_INTERVAL = 0.01
+# run : synchro en cours (générateur d'étapes), une étape par tick pour ne pas bloquer l'interface
+_live_sync = {"last_edit": None, "run": None}
+
+def live_sync_touch():
+    # Les mises à jour provoquées par l'export lui-même sont ignorées par le registre (ignoring_updates)
+    _live_sync["last_edit"] = time.monotonic()
+
+def live_sync_start():
+    _live_sync["last_edit"] = time.monotonic()
+    if not bpy.app.timers.is_registered(live_sync_tick):
+        bpy.app.timers.register(live_sync_tick, first_interval=LIVE_SYNC_INTERVAL, persistent=True)
+
+def live_sync_stop():
+    if bpy.app.timers.is_registered(live_sync_tick):
+        bpy.app.timers.unregister(live_sync_tick)
+    _live_sync["last_edit"] = None
+    _live_sync["run"] = None
+
+def live_sync_tick():
+    context = bpy.context
+    scene = context.scene
+    if scene is None or not scene.rtxpt_proj_props.live_sync:
+        _live_sync["last_edit"] = None
+        _live_sync["run"] = None
+        return None
+    if _live_sync["run"] is not None:
+        return LIVE_SYNC_STEP_INTERVAL if live_sync_step(context) else LIVE_SYNC_INTERVAL
+    last_edit = _live_sync["last_edit"]
+    if (last_edit is None or context.view_layer is None or context.window_manager.rtxpt_export_progress.running
+            or time.monotonic() - last_edit < scene.rtxpt_proj_props.live_sync_delay):
+        return LIVE_SYNC_INTERVAL
+    _live_sync["last_edit"] = None
+    if not live_sync_begin(context):
+        return LIVE_SYNC_INTERVAL
+    return LIVE_SYNC_STEP_INTERVAL
+
+def live_sync_begin(context):
+    # Même pipeline que l'export complet, limité aux collections dirty ; RTXPT n'est pas relancé
+    dirty = collection_registry.dirty_names(context.view_layer)
+    if not dirty:
+        return False
+    settings = get_export_settings(context)
+    # Une collection par tick : les workers parallèles ne s'appliquent pas ici
+    settings.update({"launch_rtxpt": False, "only_collections": dirty, "parallel_export": False})
+    # Pas d'opérateur pour self.report : erreurs et avertissements vont au statut du panneau
+    problems = []
+    def report(level, message):
+        if level & {"ERROR", "WARNING"}:
+            problems.append(message)
+
+    job = ProjectExportJob(context, settings, report)
+    _live_sync["run"] = {"job": job, "steps": job.steps(), "dirty": dirty, "problems": problems}
+    return True
+
+def live_sync_step(context):
+    # -> True tant qu'il reste des étapes
+    run = _live_sync["run"]
+    try:
+        next(run["steps"])
+        return True
+    except StopIteration as done:
+        ok = done.value
+    except Exception as e:
+        ok = False
+        run["problems"].append(str(e))
+    _live_sync["run"] = None
+    live_sync_done(context, run, ok)
+    return False
+
+def live_sync_done(context, run, ok):
+    problems = run["problems"]
+    stamp = time.strftime('%H:%M:%S')
+    if not ok or run["job"].export_errors:
+        status = f"Sync failed at {stamp}: {problems[-1] if problems else 'unknown error'}"
+    elif problems:
+        status = f"Synced {', '.join(run['dirty'])} at {stamp} with {len(problems)} warning(s): {problems[-1]}"
+    else:
+        status = f"Synced {', '.join(run['dirty'])} at {stamp}"
+    context.window_manager.rtxpt_export_progress.live_sync_status = status
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+    return ok
+
+# 6. API headless et ligne de commande (build farm)
+
+def export_project(context=None, **overrides):
+    # Point d'entrée programmatique : mêmes étapes que l'opérateur, réglages surchargeables
+    # (assets_root, project, force_full_export, parallel_export, worker_count, launch_rtxpt...).
+    context = context or bpy.context
+    settings = get_export_settings(context)
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    settings["assets_root"] = os.path.abspath(bpy.path.abspath(settings["assets_root"]))
+
+    messages = []
+    def report(level, message):
+        messages.append({"level": sorted(level)[0], "message": message})
+
+    context.view_layer.update()
+    job = ProjectExportJob(context, settings, report)
+    ok = job.run()
+    return {
+        "ok": bool(ok) and not job.export_errors,
+        "blend": bpy.data.filepath,
+        "project": settings["project"],
+        "scene_json": getattr(job, "json_path", None),
+        "exported": sorted(set(job.exported)),
+        "skipped": job.skipped_count,
+        "errors": dict(job.export_errors),
+        "material_warnings": sorted(set(job.warning_objs)),
+        "compression": {name: {"before": b, "after": a} for name, (b, a) in getattr(job, "compression_stats", {}).items()},
+        "profile": job.profiler.report(),
+        "messages": messages,
+    }
+
+def load_batch_manifest(manifest_path):
+    # JSON : [{"blend": ..., "project": ..., "assets": ...}] ou liste de chemins ; sinon un .blend par ligne.
+    # Les chemins relatifs le sont au dossier du manifest, quel que soit le dossier courant.
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    try:
+        entries = json.loads(text)
+    except ValueError:
+        entries = [line.strip() for line in text.splitlines() if line.strip() and not line.strip().startswith("#")]
+    if isinstance(entries, dict):
+        entries = entries.get("blends", [])
+    result = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"blend": entry}
+        entry = dict(entry)
+        entry["blend"] = os.path.join(base, entry["blend"])
+        # Comme "blend", relatif au dossier du manifest ; "//..." reste relatif au .blend ouvert
+        if entry.get("assets") and not entry["assets"].startswith("//"):
+            entry["assets"] = os.path.join(base, entry["assets"])
+        result.append(entry)
+    return result
+
+def run_batch_cli(argv):
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="blender -b [scene.blend] --python \"RTXPT Scene Exporter.py\" --",
+        description="Export RTXPT projects from one or more .blend files without a UI session."
+    )
+    parser.add_argument("--assets", help="RTXPT Assets folder")
+    parser.add_argument("--project", help="Project name (defaults to the .blend file name in batch mode)")
+    parser.add_argument("--blend", nargs="*", default=[], help=".blend files to export")
+    parser.add_argument("--manifest", help="JSON or text list of .blend files to export")
+    parser.add_argument("--report", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--force", action="store_true", help="Ignore the incremental export manifest")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted export from its journal")
+    parser.add_argument("--workers", type=int, default=0, help="Export collections with N parallel Blender workers")
+    parser.add_argument("--launch", action="store_true", help="Launch RTXPT after each export")
+    args = parser.parse_args(argv)
+
+    entries = [{"blend": os.path.abspath(b)} for b in args.blend]
+    if args.manifest:
+        entries.extend(load_batch_manifest(args.manifest))
+    if not entries:
+        if not bpy.data.filepath:
+            parser.error("no .blend file given (pass one to blender, or use --blend / --manifest)")
+        entries = [{"blend": bpy.data.filepath}]
+
+    results = []
+    for entry in entries:
+        blend = entry["blend"]
+        try:
+            if os.path.abspath(bpy.data.filepath or "") != os.path.abspath(blend):
+                bpy.ops.wm.open_mainfile(filepath=blend)
+            project = entry.get("project") or args.project
+            if not project:
+                project = os.path.splitext(os.path.basename(blend))[0]
+            result = export_project(
+                assets_root=entry.get("assets") or args.assets,
+                project=project,
+                force_full_export=args.force or None,
+                resume=args.resume or None,
+                parallel_export=args.workers > 1 or None,
+                worker_count=args.workers or None,
+                launch_rtxpt=args.launch,
+            )
+        except Exception as e:
+            result = {"ok": False, "blend": blend, "errors": {"": str(e)}}
+        results.append(result)
+
+    report = {"ok": all(r["ok"] for r in results), "results": results}
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
 # Register/Unregister
 
 def register():
     bpy.utils.register_class(RTXPT_AddonPreferences)
     bpy.utils.register_class(RTXPT_OT_ProjectExport)
+    bpy.utils.register_class(RTXPT_OT_ProjectExportModal)
+    bpy.utils.register_class(RTXPT_OT_SessionStop)
+    bpy.utils.register_class(RTXPT_ExportCollectionStatus)
+    bpy.utils.register_class(RTXPT_ExportProgress_Props)
     bpy.utils.register_class(RTXPT_Proj_Props)
     bpy.utils.register_class(RTXPT_PT_ExportPanel)
+    bpy.utils.register_class(RTXPT_Export_Advanced_Props)
+    bpy.utils.register_class(RTXPT_PT_ExportAdvancedPanel)
     bpy.utils.register_class(RTXPT_Camera_Props)
     bpy.utils.register_class(RTXPT_PT_CameraPanel)
     bpy.utils.register_class(RTXPT_MaterialEdit_Props)
     bpy.utils.register_class(RTXPT_PT_MaterialEditPanel)
     bpy.utils.register_class(RTXPT_OT_MaterialEditLoad)
     bpy.utils.register_class(RTXPT_OT_MaterialEditSave)
+    bpy.utils.register_class(RTXPT_OT_MaterialBulkApply)
+    bpy.utils.register_class(RTXPT_PT_MaterialBulkPanel)
 
     bpy.types.Scene.rtxpt_proj_props = bpy.props.PointerProperty(type=RTXPT_Proj_Props)
     bpy.types.Scene.rtxpt_camera_props = bpy.props.PointerProperty(type=RTXPT_Camera_Props)
+    bpy.types.Scene.rtxpt_export_advanced_props = bpy.props.PointerProperty(type=RTXPT_Export_Advanced_Props)
     bpy.types.Scene.rtxpt_material_edit_props = bpy.props.PointerProperty(type=RTXPT_MaterialEdit_Props)
+    bpy.types.WindowManager.rtxpt_export_progress = bpy.props.PointerProperty(type=RTXPT_ExportProgress_Props)
+
+    collection_registry.reset()
+    bpy.app.handlers.depsgraph_update_post.append(_registry_depsgraph_update)
+    bpy.app.handlers.load_post.append(_registry_load_post)
+    bpy.app.handlers.undo_post.append(_registry_undo_post)
+    bpy.app.handlers.redo_post.append(_registry_undo_post)
 
 def unregister():
+    live_sync_stop()
+    for handlers, handler in ((bpy.app.handlers.depsgraph_update_post, _registry_depsgraph_update),
+                              (bpy.app.handlers.load_post, _registry_load_post),
+                              (bpy.app.handlers.undo_post, _registry_undo_post),
+                              (bpy.app.handlers.redo_post, _registry_undo_post)):
+        if handler in handlers:
+            handlers.remove(handler)
+    collection_registry.reset()
+
     del bpy.types.Scene.rtxpt_proj_props
     del bpy.types.Scene.rtxpt_camera_props
+    del bpy.types.Scene.rtxpt_export_advanced_props
     del bpy.types.Scene.rtxpt_material_edit_props
+    del bpy.types.WindowManager.rtxpt_export_progress
 
+    bpy.utils.unregister_class(RTXPT_PT_MaterialBulkPanel)
+    bpy.utils.unregister_class(RTXPT_OT_MaterialBulkApply)
     bpy.utils.unregister_class(RTXPT_OT_MaterialEditSave)
     bpy.utils.unregister_class(RTXPT_OT_MaterialEditLoad)
     bpy.utils.unregister_class(RTXPT_PT_MaterialEditPanel)
     bpy.utils.unregister_class(RTXPT_MaterialEdit_Props)
     bpy.utils.unregister_class(RTXPT_PT_CameraPanel)
     bpy.utils.unregister_class(RTXPT_Camera_Props)
+    bpy.utils.unregister_class(RTXPT_PT_ExportAdvancedPanel)
+    bpy.utils.unregister_class(RTXPT_Export_Advanced_Props)
     bpy.utils.unregister_class(RTXPT_PT_ExportPanel)
     bpy.utils.unregister_class(RTXPT_Proj_Props)
+    bpy.utils.unregister_class(RTXPT_ExportProgress_Props)
+    bpy.utils.unregister_class(RTXPT_ExportCollectionStatus)
+    bpy.utils.unregister_class(RTXPT_OT_SessionStop)
+    bpy.utils.unregister_class(RTXPT_OT_ProjectExportModal)
     bpy.utils.unregister_class(RTXPT_OT_ProjectExport)
     bpy.utils.unregister_class(RTXPT_AddonPreferences)
 
+def _script_args():
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
 if __name__ == "__main__":
-    register()
+    script_args = _script_args()
+    if "--rtxpt-worker" in script_args:
+        run_export_worker(script_args[script_args.index("--rtxpt-worker") + 1])
+    elif script_args:
+        register()
+        sys.exit(run_batch_cli(script_args))
+    else:
+        register()
@@ -0,0 +1,359 @@
+# Benchmark de l'exporteur RTXPT sur des scènes synthétiques, en Blender headless (sans GPU ni réseau).
+#
+#   python benchmarks/rtxpt_export_bench.py --blender /path/to/blender
+#   python benchmarks/rtxpt_export_bench.py --blender /path/to/blender --scenarios small,large --write-baseline
+#
+# Chaque scénario tourne dans un processus `blender -b --factory-startup` neuf : la scène est générée
+# sous EXPORT_TEST (N collections x M objets x K matériaux, modificateurs, textures, meshes partagés),
+# puis exportée deux fois avec l'opérateur rtxpt.project_export (à froid, puis à chaud sans changement).
+# Les résultats sont comparés à benchmarks/baseline.json, qui doit exister (sinon échec) ;
+# --write-baseline l'écrit à partir des mesures de cette machine.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import shutil
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ADDON_PATH = os.path.join(os.path.dirname(HERE), "RTXPT Scene Exporter.py")
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+BENCH_PROJECT = "Bench"
+
+SCENARIOS = {
+    # instanced : part des objets de chaque collection qui partagent un même mesh (sans modificateur)
+    "small":     {"collections": 4,  "objects": 16,  "materials": 4,  "textures": 2, "subdivisions": 1, "instanced": 0.25},
+    "medium":    {"collections": 16, "objects": 64,  "materials": 16, "textures": 4, "subdivisions": 2, "instanced": 0.25},
+    "large":     {"collections": 32, "objects": 256, "materials": 32, "textures": 8, "subdivisions": 2, "instanced": 0.25},
+    "instanced": {"collections": 8,  "objects": 256, "materials": 4,  "textures": 2, "subdivisions": 1, "instanced": 0.9},
+}
+DEFAULT_SCENARIOS = ("small", "medium")
+
+# Métrique -> famille de seuil (écart relatif toléré par rapport à la baseline)
+# export_rss : pic de RSS pendant l'export à froid moins le RSS avant l'export (la génération de la
+# scène n'y compte pas, contrairement à peak_rss qui couvre tout le processus et reste informatif)
+METRICS = {"cold_seconds": "time", "warm_seconds": "time", "export_rss": "memory", "files": "size", "bytes": "size"}
+DEFAULT_THRESHOLDS = {"time": 0.25, "memory": 0.15, "size": 0.05}
+RSS_SAMPLE_INTERVAL = 0.005
+
+# Partie exécutée dans Blender
+
+def load_addon(addon_path):
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("rtxpt_scene_exporter", addon_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def make_texture(bpy, name, size, seed, texture_dir):
+    # Damier déterministe : mêmes octets d'une exécution à l'autre
+    import numpy as np
+    img = bpy.data.images.new(name, size, size)
+    cells = (np.indices((size, size)) // (8 + seed)).sum(axis=0) % 2
+    rgba = np.empty((size, size, 4), dtype=np.float32)
+    rgba[..., 0] = cells
+    rgba[..., 1] = (seed % 3) / 2.0
+    rgba[..., 2] = 1.0 - cells
+    rgba[..., 3] = 1.0
+    img.pixels.foreach_set(rgba.ravel())
+    img.filepath_raw = os.path.join(texture_dir, f"{name}.png")
+    img.file_format = 'PNG'
+    img.save()
+    return img
+
+def make_material(bpy, name, index, image):
+    mat = bpy.data.materials.new(name)
+    mat.use_nodes = True
+    bsdf = next(n for n in mat.node_tree.nodes if n.type == 'BSDF_PRINCIPLED')
+    bsdf.inputs["Base Color"].default_value = ((index * 0.37) % 1.0, (index * 0.61) % 1.0, 0.5, 1.0)
+    bsdf.inputs["Roughness"].default_value = 0.2 + (index % 5) * 0.15
+    if image is not None:
+        tex = mat.node_tree.nodes.new("ShaderNodeTexImage")
+        tex.image = image
+        mat.node_tree.links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
+    return mat
+
+def make_mesh(bpy, name, kind):
+    import bmesh
+    bm = bmesh.new()
+    if kind == 0:
+        bmesh.ops.create_cube(bm, size=1.0, calc_uvs=True)
+    elif kind == 1:
+        bmesh.ops.create_uvsphere(bm, u_segments=24, v_segments=12, radius=0.5, calc_uvs=True)
+    else:
+        bmesh.ops.create_cone(bm, cap_ends=True, segments=16, radius1=0.5, radius2=0.0, depth=1.0, calc_uvs=True)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return mesh
+
+def build_scene(bpy, spec, texture_dir):
+    scene = bpy.context.scene
+    root = bpy.data.collections.new("EXPORT_TEST")
+    scene.collection.children.link(root)
+
+    images = [make_texture(bpy, f"BenchTex{t}", 256, t, texture_dir) for t in range(spec["textures"])]
+    materials = [make_material(bpy, f"BenchMat{k}", k, images[k % len(images)] if images else None)
+                 for k in range(spec["materials"])]
+
+    shared_count = int(spec["objects"] * spec["instanced"])
+    for c in range(spec["collections"]):
+        collection = bpy.data.collections.new(f"Bench{c:03d}")
+        root.children.link(collection)
+        shared = make_mesh(bpy, f"BenchShared{c:03d}", c % 3)
+        shared.materials.append(materials[c % len(materials)])
+        for o in range(spec["objects"]):
+            if o < shared_count:
+                obj = bpy.data.objects.new(f"BenchInst{c:03d}_{o:03d}", shared)
+            else:
+                mesh = make_mesh(bpy, f"BenchMesh{c:03d}_{o:03d}", o % 3)
+                mesh.materials.append(materials[(c + o) % len(materials)])
+                obj = bpy.data.objects.new(f"BenchObj{c:03d}_{o:03d}", mesh)
+                if spec["subdivisions"]:
+                    obj.modifiers.new("Subdivision", 'SUBSURF').levels = spec["subdivisions"]
+                if o % 3 == 0:
+                    obj.modifiers.new("Bevel", 'BEVEL').width = 0.05
+            obj.location = (c * 40.0 + (o % 16) * 2.0, (o // 16) * 2.0, 0.0)
+            obj.rotation_euler = (0.0, 0.0, o * 0.1)
+            collection.objects.link(obj)
+    bpy.context.view_layer.update()
+
+class RssSampler:
+    # Échantillonne le RSS dans un thread pendant un bloc : pic du bloc seul, pas du processus
+    def __init__(self, current_rss):
+        self.current_rss = current_rss
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        rss = self.current_rss() or 0
+        self.peak = max(self.peak, rss)
+
+    def _run(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self._sample()
+
+    def __enter__(self):
+        self.start = self.current_rss() or 0
+        self.peak = self.start
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+    def delta(self):
+        return max(0, self.peak - self.start)
+
+def output_stats(assets_root):
+    files = 0
+    size = 0
+    for folder, _, names in os.walk(assets_root):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(folder, name))
+    return files, size
+
+def run_scenario(name, assets_root, result_path, addon_path):
+    import bpy
+    spec = SCENARIOS[name]
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    addon = load_addon(addon_path)
+    addon.register()
+
+    texture_dir = tempfile.mkdtemp(prefix="rtxpt_bench_tex_")
+    shutil.rmtree(assets_root, ignore_errors=True)
+    os.makedirs(assets_root)
+    try:
+        start = time.perf_counter()
+        build_scene(bpy, spec, texture_dir)
+        build_seconds = time.perf_counter() - start
+
+        scene = bpy.context.scene
+        scene.rtxpt_proj_props.assets_root = assets_root
+        scene.rtxpt_proj_props.project_name = BENCH_PROJECT
+        adv = scene.rtxpt_export_advanced_props
+        adv.export_textures = True
+        adv.use_instancing = True
+
+        start = time.perf_counter()
+        with RssSampler(addon.current_rss) as export_rss:
+            cold = bpy.ops.rtxpt.project_export()
+        cold_seconds = time.perf_counter() - start
+        files, size = output_stats(assets_root)
+        with open(addon.get_profile_path(assets_root, BENCH_PROJECT), 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+
+        # Export à chaud : rien n'a changé, toutes les collections doivent être ignorées
+        start = time.perf_counter()
+        warm = bpy.ops.rtxpt.project_export()
+        warm_seconds = time.perf_counter() - start
+
+        result = {
+            "scenario": name,
+            "spec": spec,
+            "ok": cold == {'FINISHED'} and warm == {'FINISHED'},
+            "build_seconds": round(build_seconds, 4),
+            "cold_seconds": round(cold_seconds, 4),
+            "warm_seconds": round(warm_seconds, 4),
+            "export_rss": export_rss.delta(),
+            "peak_rss": addon.peak_rss(),
+            "files": files,
+            "bytes": size,
+            "stages": {stage: entry["seconds"] for stage, entry in profile["stages"].items()},
+            "blender": bpy.app.version_string,
+        }
+    finally:
+        shutil.rmtree(texture_dir, ignore_errors=True)
+        addon.unregister()
+
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    return 0 if result["ok"] else 1
+
+# Partie pilote (python hors de Blender)
+
+def run_in_blender(blender_exe, name, work_dir, timeout):
+    assets_root = os.path.join(work_dir, name, "Assets")
+    result_path = os.path.join(work_dir, name, "result.json")
+    os.makedirs(os.path.dirname(result_path), exist_ok=True)
+    proc = subprocess.run(
+        [blender_exe, "-b", "--factory-startup", "--python", os.path.abspath(__file__), "--",
+         "--run-scenario", name, "--assets", assets_root, "--result", result_path, "--addon", ADDON_PATH],
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, timeout=timeout
+    )
+    if not os.path.isfile(result_path):
+        raise RuntimeError(f"scenario '{name}' failed ({proc.returncode}): {(proc.stdout or '').strip()[-500:]}")
+    with open(result_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def run_scenarios(blender_exe, names, repeat, timeout, keep_output):
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="rtxpt_bench_")
+    try:
+        for name in names:
+            runs = [run_in_blender(blender_exe, name, work_dir, timeout) for _ in range(max(1, repeat))]
+            # Meilleur temps sur les répétitions (le bruit ne fait qu'ajouter), le reste vient du premier run
+            result = dict(runs[0])
+            for metric in ("build_seconds", "cold_seconds", "warm_seconds"):
+                result[metric] = min(r[metric] for r in runs)
+            result["ok"] = all(r["ok"] for r in runs)
+            results[name] = result
+            print(f"{name}: cold {result['cold_seconds']:.2f} s, warm {result['warm_seconds']:.2f} s, "
+                  f"export +{result['export_rss'] / 1048576.0:.0f} MB (process peak {result['peak_rss'] / 1048576.0:.0f} MB), "
+                  f"{result['files']} files, {result['bytes']} bytes")
+    finally:
+        if keep_output:
+            print(f"Output kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+def environment_info(results):
+    blender = next((r.get("blender") for r in results.values()), None)
+    return {"platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(), "blender": blender}
+
+def compare_with_baseline(results, baseline, thresholds):
+    # -> ([(scénario, métrique, baseline, mesure, écart relatif)] pour chaque dépassement de seuil,
+    #     [scénarios absents de la baseline])
+    regressions = []
+    missing = []
+    for name, result in sorted(results.items()):
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            missing.append(name)
+            continue
+        for metric, family in METRICS.items():
+            expected = reference.get(metric)
+            measured = result.get(metric)
+            if not expected or measured is None:
+                continue
+            delta = (measured - expected) / expected
+            if delta > thresholds[family]:
+                regressions.append((name, metric, expected, measured, delta))
+    return regressions, missing
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="python benchmarks/rtxpt_export_bench.py",
+        description="Benchmark the RTXPT exporter on synthetic scenes in headless Blender."
+    )
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable (or $BLENDER)")
+    parser.add_argument("--scenarios", default=",".join(DEFAULT_SCENARIOS),
+                        help=f"Comma separated scenarios among {', '.join(SCENARIOS)} (or 'all')")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per scenario, the best time is kept")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--write-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--output", help="Write the results JSON to this file")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_THRESHOLDS["time"])
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_THRESHOLDS["memory"])
+    parser.add_argument("--size-threshold", type=float, default=DEFAULT_THRESHOLDS["size"])
+    parser.add_argument("--timeout", type=float, default=3600.0, help="Seconds allowed per Blender run")
+    parser.add_argument("--keep-output", action="store_true", help="Keep the exported Assets folders")
+    args = parser.parse_args(argv)
+
+    names = list(SCENARIOS) if args.scenarios == "all" else [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    results = run_scenarios(args.blender, names, args.repeat, args.timeout, args.keep_output)
+    report = {"environment": environment_info(results), "scenarios": results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    failed = [name for name, result in results.items() if not result["ok"]]
+    for name in failed:
+        print(f"{name}: export reported an error")
+
+    if args.write_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 1 if failed else 0
+
+    if not os.path.isfile(args.baseline):
+        # Sans référence, rien ne prouve l'absence de régression : échec plutôt que succès silencieux
+        print(f"FAILED: no baseline at {args.baseline}, run with --write-baseline to create one")
+        return 1
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+        print("Warning: baseline was recorded on a different machine type, timings may not be comparable")
+
+    thresholds = {"time": args.time_threshold, "memory": args.memory_threshold, "size": args.size_threshold}
+    regressions, missing = compare_with_baseline(results, baseline, thresholds)
+    for name in missing:
+        print(f"FAILED: {name} is not in the baseline, run with --write-baseline to add it")
+    for name, metric, expected, measured, delta in regressions:
+        print(f"REGRESSION {name}.{metric}: {expected} -> {measured} (+{100.0 * delta:.0f}%)")
+    if not regressions and not missing:
+        print("No regression against the baseline")
+    return 1 if (failed or regressions or missing) else 0
+
+def _blender_args():
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+if __name__ == "__main__":
+    blender_args = _blender_args()
+    if "--run-scenario" in blender_args:
+        inner = argparse.ArgumentParser()
+        inner.add_argument("--run-scenario", required=True, choices=sorted(SCENARIOS))
+        inner.add_argument("--assets", required=True)
+        inner.add_argument("--result", required=True)
+        inner.add_argument("--addon", default=ADDON_PATH)
+        inner_args = inner.parse_args(blender_args)
+        sys.exit(run_scenario(inner_args.run_scenario, inner_args.assets, inner_args.result, inner_args.addon))
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,306 @@
+# Vérifications des appels d'outils externes de l'exporteur avec des exécutables de substitution
+# (ni gltfpack ni RTXPT réels), en Python seul, sans Blender, GPU ni réseau : post-traitement
+# gltfpack (run_gltfpack) et session RTXPT (RTXPTSession.sync / request_reload).
+#
+#   python benchmarks/rtxpt_tool_checks.py
+#   python benchmarks/rtxpt_tool_checks.py --checks gltfpack_gltf,session_reload
+#
+# Ces fonctions n'utilisent que subprocess et des fichiers : l'add-on est importé avec des modules
+# bpy et mathutils factices (numpy reste nécessaire). Chaque substitut est un petit script Python
+# écrit dans un dossier temporaire et rendu exécutable (appelé par un .cmd sous Windows) ; il
+# reproduit le contrat attendu de l'outil (fichiers écrits, code de retour) et note ses arguments.
+# Code de sortie 1 si une vérification échoue.
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+import types
+from contextlib import contextmanager
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ADDON_PATH = os.path.join(os.path.dirname(HERE), "RTXPT Scene Exporter.py")
+
+# gltfpack -i <entrée> -o <sortie> [options] : buffers nommés d'après la sortie, comme le vrai gltfpack
+GLTFPACK_STANDIN = '''
+import json, os, shutil, sys
+args = sys.argv[1:]
+src, dst = args[args.index("-i") + 1], args[args.index("-o") + 1]
+folder = os.path.dirname(dst)
+with open(os.path.join(folder, "gltfpack_args.json"), "w") as f:
+    json.dump(args, f)
+if "--fail" in args:
+    sys.stderr.write("stand-in failure\\n")
+    sys.exit(3)
+if dst.endswith(".glb"):
+    shutil.copyfile(src, dst)
+    with open(dst, "ab") as f:
+        f.write(b"packed")
+    sys.exit(0)
+with open(src) as f:
+    gltf = json.load(f)
+stem = os.path.splitext(os.path.basename(dst))[0]
+for i, buffer in enumerate(gltf.get("buffers", [])):
+    name = stem + (".bin" if i == 0 else f"_{i}.bin")
+    with open(os.path.join(folder, name), "wb") as f:
+        f.write(b"packed")
+    buffer["uri"] = name
+with open(dst, "w") as f:
+    json.dump(gltf, f)
+'''
+
+# RTXPT --scene <scène> : note son lancement (pid, arguments, RTXPT_RELOAD_FILE) puis reste ouvert
+RTXPT_STANDIN = '''
+import json, os, sys, time
+with open(os.environ["RTXPT_STANDIN_LOG"], "a") as f:
+    f.write(json.dumps({"pid": os.getpid(), "argv": sys.argv[1:],
+                        "reload_file": os.environ.get("RTXPT_RELOAD_FILE")}) + "\\n")
+time.sleep(float(os.environ.get("RTXPT_STANDIN_LIFETIME", "60")))
+'''
+
+# Import de l'add-on sans Blender
+
+class StubModule(types.ModuleType):
+    # Tout attribut inconnu est une classe vide : bases des opérateurs et panneaux, propriétés
+    # (bpy.props.*Property(...)), Matrix... Rien de tout cela n'est appelé par les vérifications.
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = type(name, (), {"__init__": lambda self, *args, **kwargs: None})
+        setattr(self, name, value)
+        return value
+
+def load_addon_without_blender(addon_path):
+    names = ("bpy", "bpy.app", "bpy.app.handlers", "bpy.props", "bpy.types", "mathutils")
+    stubs = {name: StubModule(name) for name in names}
+    stubs["bpy"].app = stubs["bpy.app"]
+    stubs["bpy"].props = stubs["bpy.props"]
+    stubs["bpy"].types = stubs["bpy.types"]
+    stubs["bpy.app"].handlers = stubs["bpy.app.handlers"]
+    stubs["bpy.app.handlers"].persistent = lambda func: func
+    previous = {name: sys.modules.get(name) for name in names}
+    sys.modules.update(stubs)
+    try:
+        sys.path.insert(0, HERE)
+        from rtxpt_export_bench import load_addon
+        return load_addon(addon_path)
+    finally:
+        for name, module in previous.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+# Vérifications
+
+CHECKS = {}
+
+def check(func):
+    CHECKS[func.__name__[len("check_"):]] = func
+    return func
+
+def make_standin(folder, name, source):
+    # -> chemin exécutable du substitut
+    script = os.path.join(folder, name + ".py")
+    with open(script, 'w', encoding='utf-8') as f:
+        if os.name != 'nt':
+            f.write(f"#!{sys.executable}\n")
+        f.write(source)
+    if os.name == 'nt':
+        launcher = os.path.join(folder, name + ".cmd")
+        with open(launcher, 'w', encoding='utf-8') as f:
+            f.write(f'@"{sys.executable}" "{script}" %*\n')
+        return launcher
+    os.chmod(script, 0o755)
+    return script
+
+def write_gltf(folder, stem):
+    path = os.path.join(folder, stem + ".gltf")
+    with open(os.path.join(folder, stem + ".bin"), 'wb') as f:
+        f.write(b"\0" * 4)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({"asset": {"version": "2.0"}, "buffers": [{"uri": stem + ".bin", "byteLength": 4}]}, f)
+    return path
+
+@check
+def check_gltfpack_gltf(addon, work_dir):
+    exe = make_standin(work_dir, "gltfpack", GLTFPACK_STANDIN)
+    path = write_gltf(work_dir, "Col")
+    addon.run_gltfpack(exe, path, "-cc --label 'a b'")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        gltf = json.load(f)
+    assert [b["uri"] for b in gltf["buffers"]] == ["Col.bin"], gltf["buffers"]
+    with open(os.path.join(work_dir, "Col.bin"), 'rb') as f:
+        assert f.read() == b"packed", "buffer was not replaced by the packed one"
+    leftovers = [n for n in os.listdir(work_dir) if ".packed" in n]
+    assert not leftovers, f"packed outputs left behind: {leftovers}"
+    with open(os.path.join(work_dir, "gltfpack_args.json"), 'r', encoding='utf-8') as f:
+        args = json.load(f)
+    assert args[args.index("-i") + 1] == path and args[-3:] == ["-cc", "--label", "a b"], args
+
+@check
+def check_gltfpack_glb(addon, work_dir):
+    exe = make_standin(work_dir, "gltfpack", GLTFPACK_STANDIN)
+    path = os.path.join(work_dir, "Col.glb")
+    with open(path, 'wb') as f:
+        f.write(b"glTF")
+    addon.run_gltfpack(exe, path)
+
+    with open(path, 'rb') as f:
+        assert f.read() == b"glTFpacked", "the .glb was not replaced by the packed one"
+    assert not os.path.exists(os.path.join(work_dir, "Col.packed.glb"))
+
+@check
+def check_gltfpack_failure(addon, work_dir):
+    exe = make_standin(work_dir, "gltfpack", GLTFPACK_STANDIN)
+    path = write_gltf(work_dir, "Col")
+    with open(path, 'r', encoding='utf-8') as f:
+        before = f.read()
+    try:
+        addon.run_gltfpack(exe, path, "--fail")
+    except RuntimeError as e:
+        assert "(3)" in str(e) and "stand-in failure" in str(e), str(e)
+    else:
+        raise AssertionError("a failing gltfpack did not raise")
+    with open(path, 'r', encoding='utf-8') as f:
+        assert f.read() == before, "the model was modified by a failed gltfpack run"
+
+def read_launches(work_dir):
+    with open(os.path.join(work_dir, "rtxpt.log"), 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def wait_for_launches(work_dir, count, timeout=10.0):
+    # Le substitut écrit son journal après le démarrage de l'interpréteur
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.isfile(os.path.join(work_dir, "rtxpt.log")) and len(read_launches(work_dir)) >= count:
+            return read_launches(work_dir)
+        time.sleep(0.05)
+    raise AssertionError(f"expected {count} RTXPT launches")
+
+@contextmanager
+def standin_session(addon, work_dir, lifetime=60.0):
+    # -> (session, exécutable, scène). Le processus lancé hérite de os.environ : les variables du
+    # substitut n'y restent que le temps de la vérification, et la session est fermée à la sortie.
+    assets = os.path.join(work_dir, "Assets")
+    os.makedirs(assets)
+    scene = os.path.join(assets, "Project.scene.json")
+    with open(scene, 'w', encoding='utf-8') as f:
+        json.dump({"graph": []}, f)
+    standin_env = {"RTXPT_STANDIN_LOG": os.path.join(work_dir, "rtxpt.log"), "RTXPT_STANDIN_LIFETIME": str(lifetime)}
+    previous = {name: os.environ.get(name) for name in standin_env}
+    os.environ.update(standin_env)
+    session = addon.RTXPTSession()
+    try:
+        yield session, make_standin(work_dir, "rtxpt", RTXPT_STANDIN), scene
+    finally:
+        session.stop()
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+@check
+def check_session_reload(addon, work_dir):
+    with standin_session(addon, work_dir) as (session, exe, scene):
+        assert session.sync(exe, scene, 'RELOAD') == "launched"
+        launch = wait_for_launches(work_dir, 1)[0]
+        reload_path = os.path.join(os.path.dirname(scene), "Project.reload.json")
+        assert launch["argv"] == ["--scene", scene] and launch["reload_file"] == reload_path, launch
+        pid = session.proc.pid
+
+        models = ["Models/Project/B/B.gltf", "Models/Project/A/A.gltf"]
+        assert session.sync(exe, scene, 'RELOAD', models, ["Materials/M.material.json"]) == "reloaded"
+        assert session.proc.pid == pid and session.alive()
+        with open(reload_path, 'r', encoding='utf-8') as f:
+            request = json.load(f)
+        assert request["version"] == addon.RELOAD_PROTOCOL_VERSION and request["sequence"] == 1, request
+        assert request["pid"] == pid and request["scene"] == "Project.scene.json", request
+        assert request["models"] == sorted(models) and request["materials"] == ["Materials/M.material.json"], request
+
+        session.request_reload()
+        with open(reload_path, 'r', encoding='utf-8') as f:
+            assert json.load(f)["sequence"] == 2
+        assert len(read_launches(work_dir)) == 1, "a reload relaunched RTXPT"
+        session.stop()
+        assert not session.alive()
+
+@check
+def check_session_restart(addon, work_dir):
+    with standin_session(addon, work_dir) as (session, exe, scene):
+        assert session.sync(exe, scene, 'RESTART') == "launched"
+        first = session.proc
+        wait_for_launches(work_dir, 1)
+        assert session.sync(exe, scene, 'RESTART') == "restarted"
+        assert first.poll() is not None, "the previous instance is still running"
+        assert session.proc.pid != first.pid and session.alive()
+        wait_for_launches(work_dir, 2)
+        # Une autre scène ne peut pas être rechargée par l'instance en cours
+        other = os.path.join(os.path.dirname(scene), "Other.scene.json")
+        assert session.sync(exe, other, 'RELOAD') == "restarted"
+        assert wait_for_launches(work_dir, 3)[-1]["argv"] == ["--scene", other]
+
+@check
+def check_session_relaunch_after_exit(addon, work_dir):
+    with standin_session(addon, work_dir, lifetime=0.5) as (session, exe, scene):
+        assert session.sync(exe, scene, 'RELOAD') == "launched"
+        session.proc.wait(10)
+        assert not session.alive()
+        assert session.sync(exe, scene, 'RELOAD') == "launched"
+        wait_for_launches(work_dir, 2)
+
+@check
+def check_session_new(addon, work_dir):
+    first = None
+    try:
+        with standin_session(addon, work_dir) as (session, exe, scene):
+            assert session.sync(exe, scene, 'NEW') == "launched"
+            first = session.proc
+            assert session.sync(exe, scene, 'NEW') == "launched"
+            assert first.poll() is None and session.proc.pid != first.pid, "NEW closed the previous instance"
+    finally:
+        # L'instance précédente n'est plus suivie par la session
+        if first is not None and first.poll() is None:
+            first.terminate()
+            first.wait()
+
+def run_checks(names, addon_path):
+    addon = load_addon_without_blender(addon_path)
+    failed = []
+    for name in names:
+        work_dir = tempfile.mkdtemp(prefix=f"rtxpt_check_{name}_")
+        try:
+            CHECKS[name](addon, work_dir)
+            print(f"ok {name}")
+        except Exception as e:
+            failed.append(name)
+            print(f"FAIL {name}: {e}")
+            traceback.print_exc()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    print(f"{len(names) - len(failed)}/{len(names)} checks passed")
+    return 1 if failed else 0
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog="python benchmarks/rtxpt_tool_checks.py",
+        description="Check the exporter's external tool calls against stand-in executables, without Blender."
+    )
+    parser.add_argument("--checks", default="all", help=f"Comma separated checks among {', '.join(CHECKS)} (or 'all')")
+    parser.add_argument("--addon", default=ADDON_PATH, help="Add-on file to check")
+    args = parser.parse_args(argv)
+
+    names = list(CHECKS) if args.checks == "all" else [n.strip() for n in args.checks.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CHECKS]
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(unknown)}")
+    return run_checks(names, args.addon)
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))